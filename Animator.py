@@ -0,0 +1,162 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Animator Class moves turtles smoothly without blocking the game.  Instead of letting
+turtle.goto animate a slide (which freezes the program until the slide is over), the
+Animator queues each motion and advances every moving turtle by one step per frame,
+using turtle.ontimer.  Game logic can therefore update immediately, and clicks keep
+being handled while tiles are still sliding.
+
+Each turtle has its own queue, so motions (and actions such as hiding the turtle)
+always happen in the order they were requested.  A single Animator is shared by the
+whole game: "animator".
+"""
+import turtle
+from collections import deque
+from math import hypot
+from RenderTransaction import render
+
+FRAME_INTERVAL = 16  # milliseconds between frames (about 60 frames per second)
+PIXELS_PER_SPEED = 4  # pixels moved per frame, per unit of turtle-style speed
+
+
+class Animator:
+    """
+    Schedules motions of turtles and plays them one frame at a time.
+    A motion is either a slide over several frames or an instant action.
+    """
+    def __init__(self):
+        """Creates an Animator with nothing to animate"""
+        self.queues = {}  # turtle -> deque of Motions
+        self.destinations = {}  # turtle -> (x, y) where its queued motions end
+        self.frame_number = 0
+        self.running = False
+
+    def slide(self, a_turtle, x, y, speed=0, delay=0):
+        """
+        Moves a turtle to (x, y), after any motions already queued for it
+        :param a_turtle: turtle to move
+        :param x: x-coordinate of destination
+        :param y: y-coordinate of destination
+        :param speed: turtle-style speed (0: instant; 1: very slow; 10: fast)
+        :param delay: number of frames to wait before starting
+        """
+        if a_turtle in self.queues:
+            start_x, start_y = self.destinations[a_turtle]
+        else:
+            start_x, start_y = a_turtle.position()
+        frames = slide_frames(hypot(x - start_x, y - start_y), speed)
+        if frames == 0:
+            self.run(a_turtle, lambda: a_turtle.goto(x, y), delay)
+        else:
+            self.enqueue(a_turtle, Motion(self.frame_number + 1 + delay, frames, x, y))
+        if a_turtle in self.queues:
+            self.destinations[a_turtle] = x, y
+
+    def run(self, a_turtle, action, delay=0):
+        """
+        Performs an action on a turtle after any motions already queued for it;
+        the action is performed immediately if nothing is queued
+        :param a_turtle: turtle that the action concerns
+        :param action: function with no arguments
+        :param delay: number of frames to wait before performing the action
+        """
+        if delay == 0 and a_turtle not in self.queues:
+            action()
+        else:
+            self.enqueue(a_turtle, Motion(self.frame_number + 1 + delay, 0,
+                                          action=action))
+
+    def enqueue(self, a_turtle, motion):
+        """Adds a Motion to a turtle's queue and makes sure frames are being played"""
+        if a_turtle not in self.queues:
+            self.queues[a_turtle] = deque()
+            self.destinations[a_turtle] = a_turtle.position()
+        self.queues[a_turtle].append(motion)
+        if not self.running:
+            self.running = True
+            turtle.ontimer(self.frame, FRAME_INTERVAL)
+
+    def is_moving(self, a_turtle):
+        """Returns True if a turtle has motions still to play"""
+        return a_turtle in self.queues
+
+    def forget(self, a_turtle):
+        """Drops every motion queued for a turtle (e.g. before it is removed)"""
+        self.queues.pop(a_turtle, None)
+        self.destinations.pop(a_turtle, None)
+
+    def stop(self):
+        """Drops every queued motion"""
+        self.queues.clear()
+        self.destinations.clear()
+
+    def frame(self):
+        """
+        Plays one frame: performs due actions and advances each due slide by one
+        step, then updates the screen once
+        """
+        self.frame_number += 1
+        with render:
+            for a_turtle in list(self.queues):
+                queue = self.queues[a_turtle]
+                # instant actions that are due happen together
+                while queue and queue[0].frames == 0 and \
+                        queue[0].start <= self.frame_number:
+                    queue.popleft().action()
+                # then the slide at the front of the queue takes one step
+                if queue and queue[0].frames != 0 and \
+                        queue[0].start <= self.frame_number:
+                    if queue[0].step(a_turtle):
+                        queue.popleft()
+                if not queue:
+                    self.forget(a_turtle)
+        if self.queues:
+            turtle.ontimer(self.frame, FRAME_INTERVAL)
+        else:
+            self.running = False
+
+
+class Motion:
+    """One queued slide (frames > 0) or instant action (frames == 0) of a turtle"""
+    def __init__(self, start, frames, x=None, y=None, action=None):
+        """
+        Creates a Motion
+        :param start: frame number on which the motion may begin
+        :param frames: number of frames the slide takes (0 for an instant action)
+        :param x: x-coordinate of the slide's destination
+        :param y: y-coordinate of the slide's destination
+        :param action: function to call for an instant action
+        """
+        self.start = start
+        self.frames = frames
+        self.x = x
+        self.y = y
+        self.action = action
+        self.frames_done = 0
+        self.origin = None
+
+    def step(self, a_turtle):
+        """
+        Moves a turtle one frame further along the slide
+        :return: True if the slide is finished
+        """
+        if self.origin is None:
+            self.origin = a_turtle.position()
+        self.frames_done += 1
+        fraction = self.frames_done / self.frames
+        a_turtle.goto(self.origin[0] + (self.x - self.origin[0]) * fraction,
+                      self.origin[1] + (self.y - self.origin[1]) * fraction)
+        return self.frames_done >= self.frames
+
+
+def slide_frames(distance, speed):
+    """Returns the number of frames a slide of a distance takes at a turtle-style speed"""
+    if speed == 0 or distance == 0:
+        return 0
+    return max(1, round(distance / (speed * PIXELS_PER_SPEED)))
+
+
+animator = Animator()
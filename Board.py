@@ -0,0 +1,315 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Board Class is the headless game logic of a sliding tile puzzle.  The board is stored
+as a flat array of tile numbers (a permutation), where tile number n is the tile whose
+home is cell n, and the last tile number is the blank.  The cell of the blank is cached
+so that moves never need to search the board, and the number of misplaced tiles and
+their total Manhattan distance are kept up to date by every swap, so that checking
+whether the board is solved never needs to scan it.
+
+Board has no graphical dependencies at all, so it can shuffle, solve, and validate
+puzzles without a display.  TileSet mirrors a Board onto the screen.
+"""
+from array import array
+from random import getrandbits, shuffle
+
+# neighbor tables are shared by every Board of the same shape
+_NEIGHBOR_TABLES = {}
+
+
+class Board:
+    """
+    A columns x rows sliding puzzle stored as a flat permutation of tile numbers.
+    Cell index = row * columns + column; tile number n belongs in cell n.
+    The largest tile number is the blank.
+    """
+    def __init__(self, columns, rows=None, cells=None):
+        """
+        Creates a new Board, solved unless a starting arrangement is provided
+        :param columns: number of columns on the board
+        :param rows: number of rows on the board (default: same as columns)
+        :param cells: optional iterable of tile numbers, one per cell, in cell order
+        """
+        self.columns = columns
+        self.rows = columns if rows is None else rows
+        self.size = self.columns * self.rows
+        self.blank = self.size - 1
+        # one byte per cell is enough for boards of up to 16x16
+        self.typecode = 'B' if self.size <= 256 else 'H'
+        if cells is None:
+            self.cells = array(self.typecode, range(self.size))
+        else:
+            self.cells = array(self.typecode, cells)
+            if sorted(self.cells) != list(range(self.size)):
+                raise ValueError("cells must be a permutation of the tile numbers")
+        self.blank_index = self.cells.index(self.blank)
+        self.neighbors = neighbor_table(self.columns, self.rows)
+
+        # running totals over all non-blank tiles, updated by swap()
+        self.misplaced = 0
+        self.manhattan = 0
+        for index, tile in enumerate(self.cells):
+            if tile != self.blank:
+                self.misplaced += tile != index
+                self.manhattan += self.distance(tile, index)
+
+    def index(self, column, row):
+        """Returns the cell index of a (column, row) grid location"""
+        return row * self.columns + column
+
+    def coordinates(self, index):
+        """Returns the (column, row) grid location of a cell index"""
+        return index % self.columns, index // self.columns
+
+    def tile_at(self, column, row):
+        """Returns the number of the tile currently at a (column, row) grid location"""
+        return self.cells[row * self.columns + column]
+
+    def blank_location(self):
+        """Returns the (column, row) grid location of the blank"""
+        return self.coordinates(self.blank_index)
+
+    def distance(self, tile, index):
+        """Returns the grid (Manhattan) distance of cell index from a tile's home"""
+        columns = self.columns
+        return abs(index % columns - tile % columns) + \
+            abs(index // columns - tile // columns)
+
+    def misplaced_tiles(self):
+        """Returns the number of (non-blank) tiles that are not in their home cell"""
+        return self.misplaced
+
+    def manhattan_distance(self):
+        """Returns the sum of every (non-blank) tile's grid distance from home"""
+        return self.manhattan
+
+    def is_solvable(self):
+        """
+        Checks whether the arrangement can be solved with legal moves: every move
+        swaps the blank with a tile, so the permutation's parity must match the
+        parity of the blank's distance from its home cell
+        :return: True if the board is solvable, False otherwise
+        """
+        # permutation parity = parity of (number of cells - number of cycles)
+        seen = bytearray(self.size)
+        cycles = 0
+        for start in range(self.size):
+            if not seen[start]:
+                cycles += 1
+                index = start
+                while not seen[index]:
+                    seen[index] = 1
+                    index = self.cells[index]
+        blank_distance = self.distance(self.blank, self.blank_index)
+        return (self.size - cycles) % 2 == blank_distance % 2
+
+    def is_next_to_blank(self, index):
+        """Returns True if the cell at index is adjacent to (but not) the blank"""
+        return index in self.neighbors[self.blank_index]
+
+    def swap(self, index_1, index_2):
+        """
+        Swaps the tiles in two cells, keeping track of where the blank is and
+        updating the misplaced tile count and Manhattan distance.
+        Does not check that the swap is a legal move.
+        :param index_1: cell index of first tile
+        :param index_2: cell index of second tile
+        """
+        cells, blank = self.cells, self.blank
+        tile_1, tile_2 = cells[index_1], cells[index_2]
+        cells[index_1], cells[index_2] = tile_2, tile_1
+        # tile_1 moves from index_1 to index_2; tile_2 from index_2 to index_1
+        if tile_1 == blank:
+            self.blank_index = index_2
+        else:
+            self.misplaced += (tile_1 != index_2) - (tile_1 != index_1)
+            self.manhattan += self.distance(tile_1, index_2) - \
+                self.distance(tile_1, index_1)
+        if tile_2 == blank:
+            self.blank_index = index_1
+        else:
+            self.misplaced += (tile_2 != index_1) - (tile_2 != index_2)
+            self.manhattan += self.distance(tile_2, index_1) - \
+                self.distance(tile_2, index_2)
+
+    def move(self, index):
+        """
+        Slides the tile at index into the blank, if that is a legal move
+        :param index: cell index of the tile to slide
+        :return: True if the move was performed, False otherwise
+        """
+        if index not in self.neighbors[self.blank_index]:
+            return False
+        self.slide(index)
+        return True
+
+    def slide(self, index):
+        """
+        Slides the tile at index into the blank: a faster swap() for the usual case.
+        Does not check that the move is legal.
+        :param index: cell index of the tile to slide
+        """
+        cells, blank_index, columns = self.cells, self.blank_index, self.columns
+        tile = cells[index]
+        cells[blank_index] = tile
+        cells[index] = self.blank
+        self.blank_index = index
+        self.misplaced += (tile != blank_index) - (tile != index)
+        # the tile moved one step, either closer to or further from home
+        if index - blank_index in (1, -1):
+            closer = abs(blank_index % columns - tile % columns) < \
+                abs(index % columns - tile % columns)
+        else:
+            closer = abs(blank_index // columns - tile // columns) < \
+                abs(index // columns - tile // columns)
+        self.manhattan += -1 if closer else 1
+
+    def is_solved(self):
+        """Returns True if every tile is in its home cell"""
+        return self.misplaced == 0
+
+    def unscramble(self):
+        """Returns every tile to its home cell"""
+        self.cells = array(self.typecode, range(self.size))
+        self.blank_index = self.blank
+        self.misplaced = 0
+        self.manhattan = 0
+
+    def shuffle_moves(self, swaps=100):
+        """
+        Generator -- shuffle_moves
+            Shuffles the board by performing legal swaps of the blank. Randomly
+            chooses to perform a horizontal or vertical swap. If the blank is at the
+            edge of the board (max or min), it is moved towards the center.
+
+            Otherwise, if the selected movement axis (horizontal or vertical) is the
+            same as the previous move, the blank is moved so that the previous move
+            is NOT undone.
+
+            Otherwise, the blank is randomly swapped in one of the directions along
+            the chosen axis.
+
+            Each swap is performed on the board before it is yielded, so that a
+            caller can mirror it (e.g. animate it on screen).
+        :param swaps: the number of swaps to perform (default = 100)
+        :return: yields (old blank index, new blank index) after each swap
+        """
+        columns, rows = self.columns, self.rows
+        last_move = 5
+        for swap in range(swaps):
+            column, row = self.coordinates(self.blank_index)
+            # 50% chance of vertical swap
+            if getrandbits(1):
+                # blank in min row; can't move down
+                if row == 0:
+                    modifier = 1
+                    last_move = 2
+                # blank in max row; can't move up
+                elif row + 1 == rows:
+                    modifier = -1
+                    last_move = 4
+                # don't undo the last move if it was also vertical
+                elif last_move < 5:
+                    modifier = 3 - last_move
+                # randomly select +1 or -1
+                else:
+                    modifier = 2 * getrandbits(1) - 1
+                    last_move = 3 + modifier
+                target = self.blank_index + modifier * columns
+            # 50% chance of horizontal swap
+            else:
+                # blank in min column; can't move left
+                if column == 0:
+                    modifier = 1
+                    last_move = 6
+                # blank in max column; can't move right
+                elif column + 1 == columns:
+                    modifier = -1
+                    last_move = 8
+                # don't undo the last move if it was also horizontal
+                elif last_move > 5:
+                    modifier = 7 - last_move
+                # randomly select +1 or -1
+                else:
+                    modifier = 2 * getrandbits(1) - 1
+                    last_move = 7 + modifier
+                target = self.blank_index + modifier
+            old_blank = self.blank_index
+            self.slide(target)
+            yield old_blank, target
+
+    def shuffle(self, swaps=100):
+        """Shuffles the board with shuffle_moves() without reporting each swap"""
+        for swap in self.shuffle_moves(swaps):
+            pass
+
+    def copy(self):
+        """Returns an independent Board with the same arrangement"""
+        return Board(self.columns, self.rows, self.cells)
+
+    def snapshot(self):
+        """Returns the current arrangement as an immutable bytes object"""
+        return self.cells.tobytes()
+
+    def __eq__(self, other):
+        """Boards are equal if they have the same shape and arrangement"""
+        if not isinstance(other, Board):
+            return NotImplemented
+        return (self.columns, self.rows) == (other.columns, other.rows) and \
+            self.cells == other.cells
+
+    def __str__(self):
+        """Represent a Board as rows of tile numbers (blank shown as '.')"""
+        digits = len(str(self.size))
+        lines = []
+        for row in range(self.rows):
+            line = []
+            for column in range(self.columns):
+                tile = self.tile_at(column, row)
+                line.append(f"{'.' if tile == self.blank else tile + 1 : >{digits}}")
+            lines.append(" ".join(line))
+        return "\n".join(lines)
+
+
+def random_board(columns, rows=None):
+    """
+    Returns a uniformly random solvable Board, in time proportional to its size.
+    A random permutation is unsolvable half of the time; swapping two (non-blank)
+    tiles of an unsolvable permutation makes it solvable.
+    :param columns: number of columns on the board
+    :param rows: number of rows on the board (default: same as columns)
+    """
+    rows = columns if rows is None else rows
+    cells = list(range(columns * rows))
+    shuffle(cells)
+    board = Board(columns, rows, cells)
+    if not board.is_solvable():
+        first, second = [index for index in range(3) if index != board.blank_index][:2]
+        board.swap(first, second)
+    return board
+
+
+def neighbor_table(columns, rows):
+    """
+    Returns a tuple with, for each cell index, a tuple of the indices of the cells
+    that are adjacent to it (above, below, left, right, if on the board)
+    """
+    if (columns, rows) not in _NEIGHBOR_TABLES:
+        table = []
+        for index in range(columns * rows):
+            column, row = index % columns, index // columns
+            adjacent = []
+            if row > 0:
+                adjacent.append(index - columns)
+            if row + 1 < rows:
+                adjacent.append(index + columns)
+            if column > 0:
+                adjacent.append(index - 1)
+            if column + 1 < columns:
+                adjacent.append(index + 1)
+            table.append(tuple(adjacent))
+        _NEIGHBOR_TABLES[(columns, rows)] = tuple(table)
+    return _NEIGHBOR_TABLES[(columns, rows)]
@@ -0,0 +1,84 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+BoardGeometry Class holds where the cells of a board are drawn on screen, worked out
+once for a board's columns, rows and tile size.  Tiles look up their screen position,
+and clicks look up the cell they land in, by indexing its tables:
+    > x_screen[column], y_screen[row]: screen coordinates of each cell's centre
+    > column_at[x], row_at[y]: cell that each whole screen coordinate lands in
+Each cell's click region includes the gap after it, as the game has always counted it.
+
+Geometries are shared: board_geometry returns the same BoardGeometry for every board
+of the same shape and tile size.
+"""
+from gui import calculate_tile_border, calculate_tile_gap
+
+_GEOMETRIES = {}  # (columns, rows, tile_size) -> BoardGeometry
+
+
+class BoardGeometry:
+    """Screen coordinates of the cells of a board, and the cell at each coordinate"""
+    def __init__(self, columns, rows, tile_size):
+        """
+        Works out the geometry of a board
+        :param columns: number of columns of cells
+        :param rows: number of rows of cells
+        :param tile_size: width (and height) of each tile's image, in pixels
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tile_size = tile_size
+        # distance between the centres of neighboring cells
+        self.step = tile_size + calculate_tile_gap(tile_size)
+        border = calculate_tile_border(tile_size)  # centre of the first cell
+        self.x_screen = [border + column * self.step for column in range(columns)]
+        self.y_screen = [border + row * self.step for row in range(rows)]
+        # the first cell's click region starts half a tile before its centre
+        start = border - tile_size // 2
+        self.column_at = cell_table(start, self.step, columns)
+        self.row_at = cell_table(start, self.step, rows)
+
+    def screen_coord(self, column, row):
+        """Returns the screen x-y coordinates of a cell's centre"""
+        return self.x_screen[column], self.y_screen[row]
+
+    def cell_at(self, x, y):
+        """
+        Finds the cell a point on the screen lands in
+        :param x: screen x-coordinate
+        :param y: screen y-coordinate
+        :return: (column, row); None if the point is outside the board
+        """
+        x, y = int(x), int(y)
+        if not (0 <= x < len(self.column_at) and 0 <= y < len(self.row_at)):
+            return None
+        column, row = self.column_at[x], self.row_at[y]
+        if column is None or row is None:
+            return None
+        return column, row
+
+
+def cell_table(start, step, count):
+    """
+    Returns a table of the cell (column or row) at each whole screen coordinate
+    :param start: first screen coordinate of the first cell
+    :param step: screen distance from the start of one cell to the start of the next
+    :param count: number of cells
+    :return: list indexed by screen coordinate, up to the end of the last cell;
+             None where there is no cell
+    """
+    table = [None] * max(start, 0)
+    for cell in range(count):
+        first = start + cell * step
+        table += [cell] * (first + step - max(first, len(table)))
+    return table
+
+
+def board_geometry(columns, rows, tile_size):
+    """Returns the (shared) BoardGeometry of a board shape and tile size"""
+    key = (columns, rows, tile_size)
+    if key not in _GEOMETRIES:
+        _GEOMETRIES[key] = BoardGeometry(columns, rows, tile_size)
+    return _GEOMETRIES[key]
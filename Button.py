@@ -8,6 +8,7 @@ Can keep track of whether they have been clicked on/inside.
 Generally do not move, except for one simple animation.
 """
 from ImageTurtle import ImageTurtle
+from Animator import animator
 from gui import THUMBNAIL_X, THUMBNAIL_Y, BUTTON_X_RIGHT, BUTTON_SPACING, BUTTON_Y
 
 
@@ -29,12 +30,16 @@ class Button(ImageTurtle):
 
     def register_click(self, x, y):
         """Check a button to see if it was clicked on"""
-        x_click_inside = abs(x - self.get_x_home()) < self.get_width() / 2
-        y_click_inside = abs(y - self.get_y_home()) < self.get_height() / 2
-        if x_click_inside and y_click_inside:
+        if self.contains(x, y):
             self.state(True)
         return self.state()
 
+    def contains(self, x, y):
+        """Returns True if screen coordinates are inside the button's click region"""
+        x_click_inside = abs(x - self.get_x_home()) < self.get_width() / 2
+        y_click_inside = abs(y - self.get_y_home()) < self.get_height() / 2
+        return x_click_inside and y_click_inside
+
     def state(self, state=None):
         """
         Check or change a button's state
@@ -47,10 +52,12 @@ class Button(ImageTurtle):
         return self.button_state
 
     def use_as_new_thumbnail(self):
-        """Tells a button to move to the thumbnail position on the GUI"""
-        self.turtle.speed(5)  # this is the only time a button needs visual speed
-        self.turtle.goto(THUMBNAIL_X, THUMBNAIL_Y)
-        self.turtle.speed(0)
+        """
+        Tells a button to move to the thumbnail position on the GUI
+        The move is animated; later go_home/hide calls wait for it to finish
+        """
+        # this is the only time a button needs visual speed
+        animator.slide(self.turtle, THUMBNAIL_X, THUMBNAIL_Y, speed=5)
 
     def get_width(self):
         """Returns button's width"""
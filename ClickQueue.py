@@ -0,0 +1,95 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+ClickQueue Class records every click on the screen, with the time it arrived, and
+passes the clicks to a handler one at a time, in order.  A click that arrives while
+another is still being handled (Tk can deliver clicks whenever the screen updates)
+waits in the queue instead of being lost.
+
+Redundant clicks are coalesced: a click on a button that already has a click waiting
+in the queue would only press the button again, so it is discarded.  The queue is
+bounded so that a flood of clicks cannot grow it without limit.
+"""
+from collections import deque
+from time import monotonic
+
+MAX_CLICKS = 64  # most clicks that can wait in the queue
+
+
+class ClickQueue:
+    """
+    A bounded first-in, first-out queue of screen clicks, drained in order by a
+    handler function.  Keeps counts of clicks received, handled, coalesced and
+    dropped, and the deepest backlog seen.
+    """
+    def __init__(self, handler, target=None, capacity=MAX_CLICKS):
+        """
+        Creates an empty ClickQueue
+        :param handler: function called as handler(x, y) for each click, in order
+        :param target: optional function target(x, y) returning what a click is on
+                       (e.g. a Button), or None; clicks on the same target as a
+                       click already waiting are coalesced.  Clicks with a target
+                       of None (such as moves) are never coalesced.
+        :param capacity: most clicks that can wait (default = MAX_CLICKS)
+        """
+        self.handler = handler
+        self.target = target
+        self.capacity = capacity
+        self.clicks = deque()  # (time, x, y, target) of clicks waiting to be handled
+        self.draining = False
+        self.current = None  # target of the click being handled
+        self.received = 0
+        self.handled = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_backlog = 0
+        self.latency = 0  # seconds the most recently handled click waited
+
+    def push(self, x, y):
+        """
+        Records a click (use as the screen's onclick function), then handles every
+        waiting click unless that is already under way
+        :param x: x-coordinate of click on screen
+        :param y: y-coordinate of click on screen
+        """
+        self.received += 1
+        target = None if self.target is None else self.target(x, y)
+        if target is not None and (target is self.current or
+                                   any(click[3] is target for click in self.clicks)):
+            self.coalesced += 1
+        elif len(self.clicks) >= self.capacity:
+            self.dropped += 1
+        else:
+            self.clicks.append((monotonic(), x, y, target))
+            self.max_backlog = max(self.max_backlog, len(self.clicks))
+        if not self.draining:
+            self.drain()
+
+    def drain(self):
+        """Handles waiting clicks in the order they arrived, until none are left"""
+        self.draining = True
+        try:
+            while self.clicks:
+                time, x, y, self.current = self.clicks.popleft()
+                self.latency = monotonic() - time
+                self.handler(x, y)
+                self.handled += 1
+        finally:
+            self.draining = False
+            self.current = None
+
+    def backlog(self):
+        """Returns the number of clicks waiting to be handled"""
+        return len(self.clicks)
+
+    def clear(self):
+        """Discards every waiting click"""
+        self.clicks.clear()
+
+    def __str__(self):
+        """Represent a ClickQueue by its counts"""
+        return f"{self.received} clicks: {self.handled} handled, " \
+               f"{self.coalesced} coalesced, {self.dropped} dropped; " \
+               f"backlog {self.backlog()} (max {self.max_backlog})"
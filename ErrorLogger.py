@@ -0,0 +1,138 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+ErrorLogger Class writes error messages to the error log file on a background thread.
+Logging an error only puts it on a queue; the thread writes every waiting message with
+a single open of the file, a short interval after the first of them arrives (or once
+a batch is full), so that many errors in a row (such as a folder of broken puzzle
+files) do not each open and close the file on the main thread.  Waiting messages are
+written when the program exits.
+
+Each message can carry context, such as the puzzle file and line it is about, which is
+written after the message.  When the log file grows past a size limit, it is renamed
+to a backup (keeping a few of the most recent) and a new log file is started.
+A single ErrorLogger is shared by the whole game: "logger".
+"""
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+from os import path, replace, remove
+
+ERROR_FILE = "./Logs/error_log.err"
+FLUSH_INTERVAL = 1.0  # longest time, in seconds, that a message waits to be written
+BATCH_SIZE = 100  # waiting messages that are written without waiting for the interval
+MAX_LOG_SIZE = 1024 * 1024  # bytes the log file may reach before it is rotated
+BACKUP_COUNT = 3  # rotated log files kept (error_log.err.1 is the most recent)
+
+
+class ErrorLogger:
+    """
+    A queue of error messages, written to a log file in batches by a background
+    thread.  Counts the messages and batches it has written.
+    """
+    def __init__(self, filename=ERROR_FILE, max_size=MAX_LOG_SIZE,
+                 backup_count=BACKUP_COUNT):
+        """
+        Creates an ErrorLogger; its thread starts when the first error is logged
+        :param filename: path of the log file
+        :param max_size: bytes the log file may reach before it is rotated
+        :param backup_count: number of rotated log files to keep
+        """
+        self.filename = filename
+        self.max_size = max_size
+        self.backup_count = backup_count
+        self.messages = queue.Queue()  # lines waiting to be written; None: flush now
+        self.lock = threading.Lock()
+        self.thread = None
+        self.written = 0
+        self.batches = 0
+
+    def log(self, error_message, print_to_console=False, **context):
+        """
+        Queues an error message to be written to the log file with a timestamp
+        :param error_message: string to be saved to the error log file
+        :param print_to_console: choose whether the error should also be printed
+        :param context: details to write after the message, e.g. puzzle="mario.puz"
+        """
+        error_output = f"{datetime.now()}: Error: {error_message}"
+        if context:
+            details = ", ".join(f"{key}={value}" for key, value in context.items())
+            error_output += f" [{details}]"
+        error_output += "\n"
+        self.messages.put(error_output)
+        self.start()
+        if print_to_console:
+            print(error_output)
+
+    def start(self):
+        """Starts the background thread, if it is not already running"""
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        """Background thread: writes waiting messages in batches"""
+        while True:
+            batch = [self.messages.get()]  # wait for the first message
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            try:
+                while batch[-1] is not None and len(batch) < BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self.messages.get(timeout=remaining))
+            except queue.Empty:
+                pass  # interval passed with nothing more to add
+            self.write(batch)
+
+    def write(self, batch):
+        """
+        Appends a batch of lines to the log file, rotating it first if too big
+        :param batch: list of lines (and None for a flush request)
+        """
+        lines = [line for line in batch if line is not None]
+        try:
+            if path.isfile(self.filename) and \
+                    path.getsize(self.filename) >= self.max_size:
+                self.rotate()
+            if lines:
+                with open(self.filename, mode='a') as out_file:
+                    out_file.writelines(lines)
+                self.written += len(lines)
+                self.batches += 1
+        except OSError:
+            pass  # nowhere to report a failure to write the error log
+        finally:
+            for _ in batch:
+                self.messages.task_done()
+
+    def rotate(self):
+        """Renames the log file to the first backup, shifting older backups along"""
+        oldest = f"{self.filename}.{self.backup_count}"
+        if path.isfile(oldest):
+            remove(oldest)
+        for number in range(self.backup_count - 1, 0, -1):
+            backup = f"{self.filename}.{number}"
+            if path.isfile(backup):
+                replace(backup, f"{self.filename}.{number + 1}")
+        replace(self.filename, f"{self.filename}.1")
+
+    def flush(self):
+        """Writes every queued message now, and waits until they have been written"""
+        if self.thread is not None:
+            self.messages.put(None)  # ends the batch being collected
+            self.messages.join()
+
+    def __str__(self):
+        """Represent an ErrorLogger by its counts"""
+        return f"{self.written} errors logged in {self.batches} writes; " \
+               f"{self.messages.qsize()} waiting"
+
+
+logger = ErrorLogger()
+atexit.register(logger.flush)  # write waiting messages before the program exits
@@ -0,0 +1,189 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+GameRecording Class records a game compactly: the arrangement of the board when play
+began, and every move made since.  A move always slides the blank one cell up, down,
+left or right, so each move is stored as one of four directions, in 2 bits (four moves
+per byte); a 100-move game takes 25 bytes plus the starting arrangement.  Resets (the
+tiles put back home, see TileSet.unscramble) are recorded by the number of moves made
+before each one, so the recording keeps the whole game.
+
+A recording file holds:
+    > a header: magic, version, columns, rows, length of the puzzle name, length of
+      the player name, number of moves, number of resets
+    > the puzzle name and player name (UTF-8)
+    > the starting arrangement: one tile number per cell (2 bytes each on boards of
+      more than 256 cells)
+    > the resets: the number of moves made before each one (4 bytes each)
+    > the moves, packed four per byte, first move in the lowest 2 bits
+Recordings can be replayed (see replay) to check that a game was legal and solved.
+"""
+import struct
+from array import array
+from datetime import datetime
+from os import path, makedirs
+
+RECORDING_DIR = "./Recordings"
+MAGIC = b"TGRC"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBBBII")  # magic, version, shape, name lengths, moves, resets
+
+# directions the blank can move in, as stored in 2 bits
+UP = 0
+DOWN = 1
+LEFT = 2
+RIGHT = 3
+
+
+class GameRecording:
+    """
+    The starting arrangement of a board and the moves made on it, with the names of
+    the puzzle and player
+    """
+    def __init__(self, columns, rows, start_cells, puzzle="", player="",
+                 packed_moves=None, move_count=0, resets=()):
+        """
+        Creates a recording (of no moves, unless packed moves are given)
+        :param columns: number of columns on the board
+        :param rows: number of rows on the board
+        :param start_cells: tile numbers, one per cell, when play began (see Board)
+        :param puzzle: name of the puzzle played
+        :param player: name of the player
+        :param packed_moves: optional moves already recorded, packed 4 per byte
+        :param move_count: number of moves in packed_moves
+        :param resets: number of moves made before each reset, in order
+        """
+        self.columns = columns
+        self.rows = rows
+        self.start_cells = array('B' if columns * rows <= 256 else 'H', start_cells)
+        self.puzzle = puzzle
+        self.player = player
+        self.moves = bytearray() if packed_moves is None else bytearray(packed_moves)
+        self.move_count = move_count
+        self.resets = array('I', resets)
+
+    def record_move(self, blank_before, blank_after):
+        """
+        Records one move, given where the blank was before and after it
+        :param blank_before: cell index of the blank before the move
+        :param blank_after: cell index of the blank after the move (adjacent)
+        """
+        step = blank_after - blank_before
+        if step == -self.columns:
+            direction = UP
+        elif step == self.columns:
+            direction = DOWN
+        elif step == -1:
+            direction = LEFT
+        else:
+            direction = RIGHT
+        shift = self.move_count % 4 * 2
+        if shift == 0:
+            self.moves.append(0)
+        self.moves[-1] |= direction << shift
+        self.move_count += 1
+
+    def record_reset(self):
+        """Records that the tiles were put back home (solved), after the moves so far"""
+        self.resets.append(self.move_count)
+
+    def directions(self):
+        """Returns a list of the recorded moves' directions, in order"""
+        return [byte >> shift & 3 for byte in self.moves
+                for shift in (0, 2, 4, 6)][:self.move_count]
+
+    def get_move_count(self):
+        """Returns the number of recorded moves"""
+        return self.move_count
+
+    def set_player(self, player):
+        """Sets the name of the player the recording is of"""
+        self.player = player
+
+    def to_bytes(self):
+        """Returns the recording in its file format"""
+        puzzle = self.puzzle.encode()[:255]
+        player = self.player.encode()[:255]
+        resets = struct.pack(f"<{len(self.resets)}I", *self.resets)
+        return HEADER.pack(MAGIC, VERSION, self.columns, self.rows, len(puzzle),
+                           len(player), self.move_count, len(self.resets)) + \
+            puzzle + player + self.start_cells.tobytes() + resets + bytes(self.moves)
+
+    def save(self, filename=None):
+        """
+        Writes the recording to a file
+        :param filename: path of the file (default: a new file in the recordings
+                         directory, named after the time and player)
+        :return: path of the file written; False if it could not be written
+        """
+        if filename is None:
+            player = "".join(each for each in self.player if each.isalnum())
+            filename = path.join(RECORDING_DIR, f"{datetime.now():%Y%m%d-%H%M%S-%f}-"
+                                                f"{player or 'player'}.rec")
+        try:
+            makedirs(path.dirname(filename) or ".", exist_ok=True)
+            with open(filename, mode='wb') as out_file:
+                out_file.write(self.to_bytes())
+        except OSError:
+            return False
+        return filename
+
+    def __str__(self):
+        """Represent a GameRecording by what it records"""
+        resets = f", {len(self.resets)} resets" if self.resets else ""
+        return f"{self.player or 'unknown player'} on {self.puzzle or 'unknown puzzle'}" \
+               f" ({self.columns}x{self.rows}): {self.move_count} moves{resets}"
+
+
+def recording_from_bytes(data):
+    """
+    Reads a recording from its file format
+    :param data: bytes of a recording file
+    :return: GameRecording
+    :raises ValueError: if the data is not a valid recording
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("recording is too short")
+    magic, version, columns, rows, puzzle_length, player_length, move_count, \
+        reset_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a game recording")
+    size = columns * rows
+    cell_bytes = 1 if size <= 256 else 2
+    position = HEADER.size
+    puzzle = data[position:position + puzzle_length].decode(errors='replace')
+    position += puzzle_length
+    player = data[position:position + player_length].decode(errors='replace')
+    position += player_length
+    start_cells = array('B' if cell_bytes == 1 else 'H')
+    start_cells.frombytes(data[position:position + size * cell_bytes])
+    position += size * cell_bytes
+    resets_format = struct.Struct(f"<{reset_count}I")
+    if len(start_cells) != size or len(data) < position + resets_format.size:
+        raise ValueError("recording is truncated")
+    resets = resets_format.unpack_from(data, position)
+    packed_moves = data[position + resets_format.size:]
+    if len(packed_moves) != -(-move_count // 4):
+        raise ValueError("recording is truncated or has extra data")
+    if list(resets) != sorted(resets) or any(reset > move_count for reset in resets):
+        raise ValueError("recording has resets out of order")
+    return GameRecording(columns, rows, start_cells, puzzle, player, packed_moves,
+                         move_count, resets)
+
+
+def load_recording(filename):
+    """
+    Reads a recording file
+    :param filename: path of the file
+    :return: GameRecording
+    :raises ValueError: if the file is not a valid recording
+    """
+    with open(filename, mode='rb') as in_file:
+        return recording_from_bytes(in_file.read())
+
+
+def start_recording(board, puzzle="", player=""):
+    """Returns a new recording of play starting from a Board's current arrangement"""
+    return GameRecording(board.columns, board.rows, board.cells, puzzle, player)
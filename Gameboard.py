@@ -7,16 +7,37 @@ Gameboard Class is the primary class of the Tile Swap Game. It creates/contains
 TileSet object, Leaderboard object, LoadMenu object that stores and can toggle between
 all accessible valid puzzles, and all other GUI elements including Button objects
 for user input and text objects for printing information.  It also handles all click
-events, and instructs each of its elements to do update if clicked upon.
+events, and instructs each of its elements to do update if clicked upon.  The Buttons
+that can currently be clicked are kept in a WidgetRegistry, so that a click finds the
+Button it is on directly.
+
+Hints are worked out in the background by a HintWorker after every move, but a hint
+is only shown when the player asks for one by pressing HINT_KEY.  Pressing SOLVE_KEY
+has the puzzle solved on screen for the player, ending the game without a score.
+Pressing one of NEW_GAME_KEYS starts a new game of the current puzzle, scrambled to a
+difficulty in that key's band of moves.
 """
 from gui import *
 from LoadMenu import *
 from Leaderboard import *
 from TileSet import TileSet
+from solver import estimate_difficulty
+from HintWorker import HintWorker
 from TextTurtle import TextTurtle
+from Animator import animator
+from RenderTransaction import render
+from ClickQueue import ClickQueue
+from ImageRegistry import images
+from TurtlePool import pool
 from Button import create_gui_buttons
+from WidgetRegistry import WidgetRegistry
 
 DEFAULT_PUZZLE = "mario.puz"
+DIFFICULTY_TIME_LIMIT = 0.1  # seconds to spend on an exact difficulty after shuffling
+HINT_KEY = "h"  # key the player presses to be shown a hint
+SOLVE_KEY = "s"  # key the player presses to have the puzzle solved for them
+# keys the player presses for a new game, and the band of moves its best solution takes
+NEW_GAME_KEYS = {"1": (8, 16), "2": (17, 24), "3": (25, 32)}
 
 
 class Gameboard:
@@ -24,61 +45,98 @@ class Gameboard:
     The Gameboard class contains all elements of the Tile Game, including its GUI,
     data structures, objects, user interaction/mouseclick handling, and operation
     """
-    def __init__(self, player_name="1UP", moves_to_win=50):
+    def __init__(self, player_name="1UP", moves_to_win=50, move_slack=None,
+                 renderer=None, score_storage=None):
         """
         Creates a new Gameboard with a screen, GUI Leaderboard, score counter,
         LoadMenu (for when needed), and (default) TileSet, and shuffles the
         tileset to start the game
+        :param player_name: name to record on the leaderboard
+        :param moves_to_win: fixed number of moves allowed (if move_slack is None)
+        :param move_slack: if provided, the number of moves allowed is recalculated
+                           after each shuffle as the puzzle's difficulty (best
+                           possible solution) plus move_slack
+        :param renderer: "turtle" or "canvas" backend for drawing tiles (default
+                         None: chosen by puzzle width; see RenderBackend)
+        :param score_storage: "file" (default) or "sqlite" storage for the
+                              leaderboard (see Leaderboard)
         """
         # initialize variables
         self.player_name = player_name
         self.moves_to_win = moves_to_win
+        self.move_slack = move_slack
+        self.budget_exact = True  # False while moves_to_win is from a lower bound
+        self.renderer = renderer
         self.game_over = False
-        self.clicked = False
-
-        # create window
-        self.screen = setup_main_screen()
-
-        # create leaderboard and move counter
-        self.leaderboard = Leaderboard()
-        self.move_counter = TextTurtle(OUTER_BORDER + 20,
-                                       WINDOW_HEIGHT - OUTER_BORDER - 35, "black")
-        self.move_counter.write_score(0, self.moves_to_win)
-
-        # create puzzle load menu; load default puzzle; create default tileset
-        self.menu = LoadMenu()
-        self.puzzle_data = load_puzzle(DEFAULT_PUZZLE)
-        if self.puzzle_data is not False:
-            self.tileset = TileSet(self.puzzle_data)
-        else:  # default puzzle is somehow missing; log error and close
-            log_error("Critical error loading default puzzle", print_to_console=True)
-            quit_game()
-            raise FileNotFoundError
-
-        # create buttons
-        self.button_reset, self.button_load_other, \
-            self.button_load, self.button_quit = create_gui_buttons()
-
-        # create status/warning popups; hide initially
-        self.popup_too_many_files, self.popup_leaderboard_err, \
-            self.popup_game_status = create_popups()
-        if self.leaderboard.get_leaderboard_length() != 0:
-            self.popup_leaderboard_err.hide()
-
-        # shuffle tiles and start game
-        turtle.tracer(True)
-        self.tileset.shuffle()  # For intense shuffle: (speed=0, swaps=1000, trace=False)
-        self.screen.onclick(self.register_click)
-
-    def already_clicked(self, boolean=None):
-        """
-        Checks whether a click was already logged
-        :param boolean: if provided, records boolean as new "clicked" state
-        :return: whether a click was previously logged
-        """
-        if boolean is not None:
-            self.clicked = boolean
-        return self.clicked
+
+        with render:  # the whole Gameboard is drawn in a single update
+            # create window (tracing stays off; drawing is shown by render transactions)
+            self.screen = setup_main_screen()
+
+            # create leaderboard and move counter
+            self.leaderboard = Leaderboard(score_storage)
+            self.move_counter = TextTurtle(OUTER_BORDER + 20,
+                                           WINDOW_HEIGHT - OUTER_BORDER - 35, "black")
+            self.move_counter.write_score(0, self.moves_to_win)
+            self.optimal_report = TextTurtle(BOARD_SIZE + INNER_BORDER + 10,
+                                             BOARD_SIZE - 15, "blue")
+            self.hint_display = TextTurtle(OUTER_BORDER + 240,
+                                           WINDOW_HEIGHT - OUTER_BORDER - 35, "blue")
+            self.rank_report = TextTurtle(BOARD_SIZE + INNER_BORDER + 10,
+                                          BOARD_SIZE - 40, "blue")
+            self.optimal = None  # best possible score of the current game, once known
+            self.hint_wanted = False  # player asked for a hint that is not ready yet
+            self.solve_wanted = False  # player asked for the puzzle to be solved
+            self.gave_up_on = None  # arrangement the HintWorker could not solve in time
+
+            # create puzzle load menu; load default puzzle; create default tileset
+            self.menu = LoadMenu()
+            self.puzzle_data = load_puzzle(DEFAULT_PUZZLE)
+            if self.puzzle_data is not False:
+                self.tileset = TileSet(self.puzzle_data, self.renderer)
+            else:  # default puzzle is somehow missing; log error and close
+                log_error("Critical error loading default puzzle", print_to_console=True)
+                quit_game()
+                raise FileNotFoundError
+
+            # create buttons
+            self.button_reset, self.button_load_other, \
+                self.button_load, self.button_quit = create_gui_buttons()
+            self.buttons = WidgetRegistry()  # Buttons that can currently be clicked
+            for button in [self.button_reset, self.button_load, self.button_quit]:
+                self.buttons.add(button)
+
+            # create status/warning popups; hide initially
+            self.popup_leaderboard_err, self.popup_game_status = create_popups()
+            if self.leaderboard.get_leaderboard_length() != 0:
+                self.popup_leaderboard_err.hide()
+            images.preload(POPUP_IMAGES)
+
+            # shuffle tiles and start game
+            # For intense shuffle: (speed=0, swaps=1000, trace=False)
+            self.tileset.shuffle()
+            self.calibrate_moves()
+            self.hint_worker = HintWorker(self.show_hint)
+            self.hint_worker.submit(self.tileset.board)
+            # every click is queued and handled in order; none are lost
+            self.clicks = ClickQueue(self.register_click, self.click_target)
+            self.screen.onclick(self.clicks.push)
+            self.screen.onkey(self.ask_hint, HINT_KEY)
+            self.screen.onkey(self.ask_solve, SOLVE_KEY)
+            for key, band in NEW_GAME_KEYS.items():
+                self.screen.onkey(lambda band=band: self.new_game(*band), key)
+            self.screen.listen()
+
+    def click_target(self, x, y):
+        """
+        Finds the Button (if any) that a click is on, so that the ClickQueue can
+        coalesce repeated clicks on it
+        :return: Button object, or None if no Button is at the click
+        """
+        button = self.buttons.widget_at(x, y)
+        if button is None and self.menu.show_menu():
+            button = self.menu.widget_at(x, y)
+        return button
 
     def register_click(self, x, y):
         """
@@ -87,77 +145,257 @@ class Gameboard:
          > Buttons trigger appropriate actions at appropriate times
          > If Menu is open, allow Menu selections
          > If Menu is closed and game is not over, allow Tile actions
+        Clicks arrive one at a time, in order, from the Gameboard's ClickQueue
         """
-        # avoid registering multiple clicks simultaneously
-        if self.already_clicked():
-            return None
-        self.already_clicked(True)
-        # check screen objects for clicks
-        self.button_load.register_click(x, y)
-        self.button_quit.register_click(x, y)
-        # load puzzle menu is shown; check for selection of a thumbnail
-        if self.menu.show_menu():
-            self.menu.register_click(x, y)
-            self.button_load_other.register_click(x, y)
-            self.check_menu_selection()
-            # user selected to manually enter a filename
-            if self.button_load_other.state():
-                self.button_load_other.state(False)
-                self.load_file_manually()
-        # only allow game moves or game resets if not in load menu
-        elif not self.game_over:
-            self.tileset.register_click(x, y)  # check if tile was clicked
-            self.button_reset.register_click(x, y)  # check if reset button was clicked
-            # if running out of moves, change move counter to red
-            if self.tileset.move_count() + 10 >= self.moves_to_win:
-                self.move_counter.change_color("red")
-            # update score
-            self.move_counter.write_score(self.tileset.move_count(), self.moves_to_win)
-            # check for victory
-            if self.tileset.victory_achieved():
-                self.victory()
-                # turtle.ontimer(quit_game, 3000)
-            # check for loss
-            elif self.tileset.move_count() >= self.moves_to_win:
-                # show loss message
-                self.popup_game_status.change_image("Resources/Lose.gif")
+        with render:  # each click is drawn in a single update
+            # check screen objects for clicks (only Buttons that can be clicked now)
+            button = self.buttons.widget_at(x, y)
+            if button is not None:
+                button.state(True)
+            # load puzzle menu is shown; check for selection of a thumbnail
+            if self.menu.show_menu():
+                self.menu.register_click(x, y)
+                self.check_menu_selection()
+                # user selected to manually enter a filename
+                if self.button_load_other.state():
+                    self.button_load_other.state(False)
+                    self.load_file_manually()
+            # only allow game moves or game resets if not in load menu
+            elif not self.game_over:
+                moves_before = self.tileset.move_count()
+                self.tileset.register_click(x, y)  # check if tile was clicked
+                # if running out of moves, change move counter to red
+                if self.tileset.move_count() + 10 >= self.moves_to_win:
+                    self.move_counter.change_color("red")
+                # update score
+                self.write_move_count()
+                # check for victory
+                if self.tileset.victory_achieved():
+                    self.victory()
+                    # turtle.ontimer(quit_game, 3000)
+                # check for loss (not until the move budget is known exactly)
+                elif self.budget_exact and \
+                        self.tileset.move_count() >= self.moves_to_win:
+                    self.defeat()
+                    # turtle.ontimer(quit_game, 3000)
+                # ask for a new hint after every move
+                if self.tileset.move_count() != moves_before:
+                    self.request_hint()
+            # if reset button is pressed
+            if self.button_reset.state():
+                self.tileset.unscramble()  # tell tileset to unscramble itself
+                self.button_reset.state(False)  # reset button state to unpressed
+                self.request_hint()
+            # if load button is pressed
+            if self.button_load.state():
+                self.open_load_menu()
+            # if quit button is pressed
+            if self.button_quit.state():
+                if not self.game_over and not self.menu.show_menu():
+                    self.save_recording()  # unfinished game
+                self.popup_game_status.change_image("Resources/quitmsg.gif")
                 self.popup_game_status.show()
-                self.game_over = True
-                # turtle.ontimer(quit_game, 3000)
-        # if reset button is pressed
-        if self.button_reset.state():
-            self.tileset.unscramble()  # tell tileset to unscramble itself
-            self.button_reset.state(False)  # reset button state to unpressed
-        # if load button is pressed
-        if self.button_load.state():
-            self.open_load_menu()
-        # if quit button is pressed
-        if self.button_quit.state():
-            self.popup_game_status.change_image("Resources/quitmsg.gif")
-            self.popup_game_status.show()
-            turtle.ontimer(quit_game, 2000)
-        self.already_clicked(False)  # click resolved: allow registering new clicks
+                turtle.ontimer(lambda: quit_game(self), 2000)
+
+    def request_hint(self):
+        """
+        Clears the current hint and asks the HintWorker to work out the next one
+        (shown only if the player asks for it; see ask_hint)
+        """
+        self.hint_display.clear()
+        if self.optimal is None:
+            return None  # the worker is still solving where play began (see show_hint)
+        if self.game_over or self.tileset.is_solved():
+            self.hint_worker.cancel()
+        else:
+            self.hint_worker.submit(self.tileset.board)
+
+    def ask_hint(self):
+        """
+        Shows the next move when the player presses HINT_KEY; if the HintWorker has
+        not finished yet, it is shown when it does (see show_hint)
+        """
+        if self.game_over or self.menu.show_menu() or self.tileset.is_solved():
+            return None
+        known = self.tileset.known_solution
+        if known is not None and known[0] == self.tileset.board.snapshot():
+            self.write_hint(known[1])
+        elif self.gave_up_on == self.tileset.board.snapshot():
+            self.write_no_solution()
+        else:
+            self.hint_wanted = True
+
+    def ask_solve(self):
+        """
+        Solves the puzzle on screen when the player presses SOLVE_KEY; if the
+        HintWorker has not finished yet, it is solved when it does (see show_hint)
+        """
+        if self.game_over or self.menu.show_menu() or self.tileset.is_solved():
+            return None
+        known = self.tileset.known_solution
+        if known is not None and known[0] == self.tileset.board.snapshot():
+            self.solve_for_player(known[1])
+        elif self.gave_up_on == self.tileset.board.snapshot():
+            self.write_no_solution()
+        else:
+            self.solve_wanted = True
+
+    def show_hint(self, board, solution):
+        """
+        Receives a solution from the HintWorker, and displays the next move if the
+        player is waiting for a hint
+        :param board: the Board that was solved
+        :param solution: list of cell indices to slide into the blank (see solver);
+                         False if the HintWorker gave up at its time limit
+        """
+        if board == self.tileset.start_board and self.optimal is None:
+            # first solution of a new game (False: the best score stays unknown)
+            self.optimal = False if solution is False else len(solution)
+            if not self.budget_exact:
+                self.settle_budget()
+            if self.tileset.victory_achieved() and solution is not False:
+                self.write_optimal_report()  # the game was won before it was known
+            elif board != self.tileset.board:
+                self.request_hint()  # moves were made meanwhile; solve from here
+                return None
+        if self.game_over or self.menu.show_menu() or board != self.tileset.board:
+            return None
+        if solution is False:
+            self.gave_up_on = board.snapshot()
+            if self.hint_wanted or self.solve_wanted:
+                self.write_no_solution()
+            return None
+        self.tileset.known_solution = board.snapshot(), solution
+        if self.solve_wanted:
+            self.solve_for_player(solution)
+        elif self.hint_wanted:
+            self.write_hint(solution)
+
+    def write_no_solution(self):
+        """Tells the player that the HintWorker gave up on the current board"""
+        self.hint_wanted = self.solve_wanted = False
+        with render:
+            self.hint_display.clear()
+            self.hint_display.write("No solution found in time", 14)
+
+    def solve_for_player(self, solution):
+        """
+        Plays a solution of the current board on screen; the game ends without a
+        score (the moves are recorded, but not counted)
+        :param solution: list of cell indices to slide into the blank (see solver)
+        """
+        self.solve_wanted = self.hint_wanted = False
+        with render:
+            self.hint_display.clear()
+            self.tileset.play(solution)
+            self.hint_display.write("Solved for you: no score", 14)
+            self.save_recording()
+            self.game_over = True
+            self.buttons.remove(self.button_reset)  # game over: no resetting
+        self.hint_worker.cancel()
+
+    def write_hint(self, solution):
+        """
+        Displays the direction of the next move of a solution of the current board
+        :param solution: list of cell indices to slide into the blank (see solver)
+        """
+        self.hint_wanted = False
+        if len(solution) == 0:
+            return None
+        board = self.tileset.board
+        # direction the hinted tile slides, towards the blank
+        step = board.blank_index - solution[0]
+        if step == 1:
+            direction = "right"
+        elif step == -1:
+            direction = "left"
+        elif step > 0:
+            direction = "down"
+        else:
+            direction = "up"
+        with render:
+            self.hint_display.clear()
+            self.hint_display.write(f"Hint: slide {direction} "
+                                    f"({len(solution)} to go)", 14)
 
     def victory(self):
         """Display victory message; update leaderboard; set game_over to True"""
         # show victory message
         self.popup_game_status.change_image("Resources/winner.gif")
         self.popup_game_status.show()
-        # add score to leaderboard
-        self.leaderboard.update_leaderboard(self.tileset.move_count(), self.player_name)
+        # add score to leaderboard, if the game's recording verifies it
+        recording = self.save_recording()
+        score = self.tileset.move_count()
+        if self.leaderboard.update_leaderboard(score, self.player_name,
+                                               self.puzzle_data['name'],
+                                               self.tileset.width, self.moves_to_win,
+                                               recording):
+            # show the player's place among all scores, and their best
+            statistics = self.leaderboard.get_statistics()
+            self.rank_report.write(f"Rank {statistics.rank(score)} of "
+                                   f"{statistics.get_total()} (percentile "
+                                   f"{statistics.percentile(score):.0f})\n"
+                                   f"Your best: "
+                                   f"{statistics.personal_best(self.player_name)}", 12)
+        else:  # score rejected
+            self.rank_report.change_color("red")
+            self.rank_report.write("Score not added to the leaderboard:\n"
+                                   "the game was reset or auto-solved", 12)
+        # compare score against the best possible solution (once the HintWorker
+        # has found it, if it has not yet)
+        if self.optimal is not None and self.optimal is not False:
+            self.write_optimal_report()
+        self.game_over = True
+        self.buttons.remove(self.button_reset)  # game over: no resetting
+
+    def defeat(self):
+        """Display loss message; set game_over to True"""
+        self.popup_game_status.change_image("Resources/Lose.gif")
+        self.popup_game_status.show()
+        self.save_recording()
         self.game_over = True
+        self.buttons.remove(self.button_reset)  # game over: no resetting
+
+    def write_optimal_report(self):
+        """Writes the best possible score of the game, and how far above it it was won"""
+        above = self.tileset.move_count() - self.optimal
+        with render:
+            self.optimal_report.write(f"Best possible: {self.optimal} (+{above})", 14)
+
+    def save_recording(self):
+        """
+        Saves the current game's recording (see GameRecording) to a file, if any moves
+        were made
+        :return: the GameRecording
+        """
+        recording = self.tileset.recording
+        recording.set_player(self.player_name)
+        if recording.get_move_count() > 0:
+            recording.save()
+        return recording
 
     def open_load_menu(self):
         """Dismiss the tileset and show the 'load puzzle' menu"""
+        if self.menu.show_menu():  # already shown; the tileset is already dismissed
+            self.button_load.state(False)
+            return None
+        if not self.game_over:
+            self.save_recording()  # unfinished game
         self.tileset.reset()  # dismiss tileset
         self.button_reset.hide()  # hide reset button (it's useless)
         self.button_load_other.show()  # replace reset button with load-by-filename button
+        self.buttons.remove(self.button_reset)
+        self.buttons.add(self.button_load_other)
         self.popup_game_status.hide()
         self.move_counter.clear()
+        self.optimal_report.clear()
+        self.rank_report.clear()
+        self.rank_report.reset_color()
+        self.hint_worker.cancel()
+        self.hint_wanted = self.solve_wanted = False
+        self.hint_display.clear()
         self.button_load.state(False)  # reset load button state to unpressed
-        self.menu.show_menu(True)  # show load menu
-        if self.menu.too_many():  # if more than 9 files are found, show notification
-            self.popup_too_many_files.show()
+        self.menu.show_menu(True)  # show load menu (preloads its shown page)
 
     def check_menu_selection(self):
         """
@@ -167,7 +405,7 @@ class Gameboard:
         if self.menu.selection() is not None:
             # load new puzzle; replace tiles with new tileset
             self.puzzle_data = self.menu.selected_puzzle_data()
-            self.tileset = TileSet(self.puzzle_data)
+            self.tileset = TileSet(self.puzzle_data, self.renderer)
             self.close_menu()
 
     def load_file_manually(self):
@@ -176,7 +414,7 @@ class Gameboard:
         loaded_file = load_puzzle(file_to_load)
         if loaded_file is not False:
             self.puzzle_data = loaded_file
-            self.tileset = TileSet(self.puzzle_data)
+            self.tileset = TileSet(self.puzzle_data, self.renderer)
             self.close_menu()
         else:
             self.popup_leaderboard_err.change_image("Resources/file_error.gif")
@@ -191,19 +429,101 @@ class Gameboard:
         self.menu.reset_selection()
         self.button_load_other.hide()
         self.button_reset.show()
-        self.popup_too_many_files.hide()
+        self.buttons.remove(self.button_load_other)
+        self.buttons.add(self.button_reset)
         self.popup_leaderboard_err.hide()
-        # reset move counter
-        self.move_counter.reset_color()
-        self.move_counter.write_score(self.tileset.move_count(), self.moves_to_win)
-        # shuffle tiles & begin game
-        turtle.tracer(True)
+        # shuffle tiles & begin game; reset move counter
         self.tileset.shuffle()
+        self.begin_game()
+
+    def new_game(self, minimum, maximum):
+        """
+        Starts a new game of the current puzzle when the player presses one of
+        NEW_GAME_KEYS, scrambled so that its best possible score is in the key's
+        band (see TileSet.scramble); the current game carries on if none is found
+        :param minimum: fewest moves the best solution may take
+        :param maximum: most moves the best solution may take
+        """
+        if self.menu.show_menu():
+            return None
+        tileset = TileSet(self.puzzle_data, self.renderer)
+        with render:
+            if not tileset.scramble(minimum, maximum):
+                tileset.reset()
+                self.hint_display.clear()
+                self.hint_display.write("No puzzle found in that range", 14)
+                return None
+            if not self.game_over:
+                self.save_recording()  # unfinished game
+            self.tileset.reset()  # dismiss old tileset
+            self.tileset = tileset
+            self.buttons.add(self.button_reset)
+            self.popup_game_status.hide()
+            self.optimal_report.clear()
+            self.rank_report.clear()
+            self.rank_report.reset_color()
+            self.hint_wanted = self.solve_wanted = False
+            self.hint_display.clear()
+            self.begin_game()
+
+    def begin_game(self):
+        """Resets the move counter and starts working out the new game's best score"""
+        self.calibrate_moves()
+        self.move_counter.reset_color()
+        self.write_move_count()
+        self.optimal = None
+        self.hint_worker.submit(self.tileset.board)
         self.game_over = False
 
+    def calibrate_moves(self):
+        """
+        If the Gameboard has a move slack, set the number of moves allowed to the
+        shuffled puzzle's difficulty plus the slack, and update the move counter.
+        If the difficulty could not be found exactly in DIFFICULTY_TIME_LIMIT, the
+        budget (from a lower bound) is provisional: it is shown as "at least", no
+        loss is declared, and it is settled when the HintWorker finds the best
+        possible score or gives up (see settle_budget)
+        """
+        if self.move_slack is None:
+            return None
+        difficulty, exact = estimate_difficulty(self.tileset.board,
+                                                DIFFICULTY_TIME_LIMIT)
+        self.moves_to_win = difficulty + self.move_slack
+        self.budget_exact = exact
+        self.write_move_count()
+
+    def settle_budget(self):
+        """
+        Sets the number of moves allowed to the best possible score plus the slack,
+        once the HintWorker has found it, and checks whether the game is lost.  If
+        the HintWorker gave up (after HINT_TIME_LIMIT), the lower bound plus the
+        slack becomes the final number of moves allowed
+        """
+        if self.optimal is not False:
+            self.moves_to_win = self.optimal + self.move_slack
+        self.budget_exact = True
+        if self.game_over or self.menu.show_menu():
+            return None
+        with render:
+            self.write_move_count()
+            if self.tileset.move_count() >= self.moves_to_win:
+                self.defeat()
+
+    def write_move_count(self):
+        """Updates the move counter (a provisional budget is shown with a '+')"""
+        budget = self.moves_to_win if self.budget_exact else f"{self.moves_to_win}+"
+        self.move_counter.write_score(self.tileset.move_count(), budget)
+
 
-def quit_game():
-    """Display the closing credits for several seconds before ending the program"""
+def quit_game(gameboard=None):
+    """
+    Display the closing credits for several seconds before ending the program
+    :param gameboard: Gameboard being closed, whose HintWorker is stopped (optional)
+    """
+    if gameboard is not None:
+        gameboard.hint_worker.stop()  # no more searching, or results to show
+    animator.stop()  # turtles are about to be cleared; drop their animations
     turtle.clearscreen()
+    pool.clear()
     SplashScreen("Resources/credits.gif", 460, 430)
     turtle.ontimer(turtle.bye, 3000)
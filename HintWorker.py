@@ -0,0 +1,95 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+HintWorker Class runs the solver on a background thread, so that a deep search never
+blocks the turtle main loop.  The Gameboard hands it a snapshot of the board after
+every move; a newer snapshot cancels any search still running on an older one.
+Results are collected on the main thread with turtle.ontimer, because turtle (Tk)
+may only be used from the main thread.  Each search gives up after a time limit, and
+a search that gave up is reported too, so that the game is never left waiting.
+"""
+import threading
+import queue
+import turtle
+from solver import solve, HINT_TIME_LIMIT
+
+POLL_INTERVAL = 50  # milliseconds between checks for finished searches
+
+
+class HintWorker:
+    """
+    A background solver service.  Boards are submitted with submit(); only the most
+    recent submission is solved.  Each finished solution is passed, on the main
+    thread, to the on_result function along with the board it solves.
+    """
+    def __init__(self, on_result, time_limit=HINT_TIME_LIMIT):
+        """
+        Creates a HintWorker and starts its thread and result polling
+        :param on_result: function called as on_result(board, solution) on the main
+                          thread; solution is a list of cell indices (see solver), or
+                          False if the search gave up at the time limit
+        :param time_limit: number of seconds to spend on each board (None: no limit)
+        """
+        self.on_result = on_result
+        self.time_limit = time_limit
+        self.generation = 0  # increases with every submission or cancellation
+        self.pending = None  # (generation, board) waiting to be solved
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.results = queue.Queue()
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        turtle.ontimer(self.poll, POLL_INTERVAL)
+
+    def submit(self, board):
+        """
+        Asks for a board to be solved; any earlier search is abandoned
+        :param board: Board object (a copy is taken, so the caller may keep moving)
+        """
+        with self.lock:
+            self.generation += 1
+            self.pending = self.generation, board.copy()
+        self.wake.set()
+
+    def cancel(self):
+        """Abandons any running or waiting search"""
+        with self.lock:
+            self.generation += 1
+            self.pending = None
+
+    def is_stale(self, generation):
+        """Returns True if a search for the given generation is no longer wanted"""
+        return generation != self.generation or not self.running
+
+    def run(self):
+        """Worker thread: solves the most recent submission, until stopped"""
+        while self.running:
+            self.wake.wait()
+            with self.lock:
+                self.wake.clear()
+                request, self.pending = self.pending, None
+            if request is None:
+                continue
+            generation, board = request
+            solution = solve(board, self.time_limit,
+                             cancel=lambda: self.is_stale(generation))
+            if not self.is_stale(generation):  # gave up at the time limit, if False
+                self.results.put((generation, board, solution))
+
+    def poll(self):
+        """Main thread: passes finished, still-wanted results on to on_result"""
+        while not self.results.empty():
+            generation, board, solution = self.results.get()
+            if not self.is_stale(generation):
+                self.on_result(board, solution)
+        if self.running:
+            turtle.ontimer(self.poll, POLL_INTERVAL)
+
+    def stop(self):
+        """Stops the worker thread and result polling"""
+        self.running = False
+        self.cancel()
+        self.wake.set()
@@ -0,0 +1,197 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+ImageRegistry Class keeps every image used by the game's turtles, so that each GIF file
+is decoded only once.  turtle.addshape decodes its file again every time it is called;
+the registry instead registers each decoded image as a turtle shape the first time it
+is needed and reuses it afterwards.
+
+Images can be preloaded: their files are read on a background thread, and decoded on
+the main thread a few at a time with turtle.ontimer (Tk may only be used from the main
+thread).  Decoded images are kept in least-recently-used order; when their estimated
+memory use exceeds a limit, the least recently used images that no turtle is showing
+are evicted.  A single ImageRegistry is shared by the whole game: "images".
+
+Images cut from a sprite sheet (see sprite_sheet) are registered the same way: the
+sheet is decoded once, and each tile is cut out of it when the tile is first needed.
+Images in a puzzle bundle (see puzzle_bundle) are decoded from the bundle's bytes.
+"""
+import base64
+import queue
+import threading
+import tkinter
+import turtle
+from collections import OrderedDict
+from sprite_sheet import parse_image_name, source_file, cut_image
+from puzzle_bundle import is_bundle_image, read_image
+
+MEMORY_LIMIT = 32 * 1024 * 1024  # bytes of decoded images to keep (estimated)
+BYTES_PER_PIXEL = 4  # estimated memory per decoded pixel
+DECODES_PER_TICK = 4  # preloaded images decoded each time the registry is polled
+POLL_INTERVAL = 20  # milliseconds between decoding preloaded images
+# shape registered in place of an evicted image (turtle cannot unregister a shape)
+EVICTED_SHAPE = ((0, 0), (0, 0), (0, 0))
+
+
+class ImageRegistry:
+    """
+    A cache of decoded images, registered as turtle shapes under their filenames.
+    Turtles take an image with use() and give it back with release(); images in use
+    are never evicted.  Anything else that shows an image (such as a canvas item)
+    takes the decoded image itself with acquire().
+    """
+    def __init__(self, memory_limit=MEMORY_LIMIT):
+        """
+        Creates an empty ImageRegistry
+        :param memory_limit: estimated bytes of decoded images to keep
+        """
+        self.memory_limit = memory_limit
+        self.sizes = OrderedDict()  # image -> estimated bytes; least recent first
+        self.photos = {}  # image -> decoded image (tkinter PhotoImage)
+        self.memory = 0
+        self.users = {}  # image -> set of turtles (or other users) showing it
+        self.user_images = {}  # turtle (or other user) -> image it is showing
+        self.preloaded = queue.Queue()  # (image, encoded data) read by the threads
+        self.readers = 0  # background threads still reading files
+        self.decoding = False  # whether preloaded images are being decoded
+        self.decodes = 0
+        self.hits = 0
+
+    def use(self, a_turtle, image):
+        """
+        Gives a turtle an image as its shape, decoding the image only if it is
+        not already registered
+        :param a_turtle: turtle to show the image
+        :param image: filename of a GIF image
+        """
+        self.acquire(a_turtle, image)
+        a_turtle.shape(image)
+
+    def acquire(self, user, image):
+        """
+        Records that a user (a turtle, or e.g. a canvas item) shows an image,
+        decoding the image only if it is not already registered
+        :param user: hashable object that will show the image
+        :param image: filename of a GIF image
+        :return: the decoded image (tkinter PhotoImage)
+        """
+        self.release(user)
+        self.register(image)
+        self.users.setdefault(image, set()).add(user)
+        self.user_images[user] = image
+        return self.photos[image]
+
+    def release(self, user):
+        """Records that a turtle (or other user) no longer shows its image"""
+        image = self.user_images.pop(user, None)
+        if image is not None:
+            self.users[image].discard(user)
+            if not self.users[image]:
+                del self.users[image]
+
+    def register(self, image, data=None):
+        """
+        Makes sure an image is registered as a turtle shape, and marks it as the
+        most recently used image
+        :param image: filename of a GIF image (or name of an image cut from a sheet)
+        :param data: optional base64-encoded contents of the file, if already read
+        """
+        if image in self.sizes:
+            self.sizes.move_to_end(image)
+            self.hits += 1
+            return None
+        screen = turtle.Screen()
+        sheet = parse_image_name(image)
+        if sheet is not None:  # cut from its (decoded once) sprite sheet
+            source, index, grid = sheet
+            self.register(source)
+            photo = cut_image(self.photos[source], index, grid)
+        elif data is None and is_bundle_image(image):
+            data = base64.b64encode(read_image(image))
+            photo = tkinter.PhotoImage(data=data, master=screen.cv)
+        elif data is None:
+            photo = tkinter.PhotoImage(file=image, master=screen.cv)
+        else:
+            photo = tkinter.PhotoImage(data=data, master=screen.cv)
+        screen.register_shape(image, turtle.Shape("image", photo))
+        self.photos[image] = photo
+        self.decodes += 1
+        self.sizes[image] = photo.width() * photo.height() * BYTES_PER_PIXEL
+        self.memory += self.sizes[image]
+        self.evict(keep=image)
+
+    def evict(self, keep=None):
+        """
+        Drops least recently used images that are not in use, until within limit.
+        Turtles give up an image (see TurtlePool.checkin) before it is released, so
+        no turtle still has the shape of an evicted image.  The image's shape is
+        replaced by EVICTED_SHAPE, so the screen no longer holds the decoded image;
+        it is registered again if it is used again.
+        :param keep: image not to drop (one just registered, not yet in use)
+        """
+        if self.memory <= self.memory_limit:
+            return None
+        screen = turtle.Screen()
+        for image in list(self.sizes):
+            if self.memory <= self.memory_limit:
+                break
+            if image not in self.users and image != keep:
+                self.memory -= self.sizes.pop(image)
+                del self.photos[image]
+                screen.register_shape(image, EVICTED_SHAPE)
+
+    def preload(self, images):
+        """
+        Reads image files on a background thread; they are decoded on the main
+        thread shortly afterwards, so that they are ready when needed
+        :param images: iterable of GIF filenames
+        """
+        to_read = []
+        for image in images:  # read each file once, even if a sheet has many tiles
+            source = source_file(image)
+            if image not in self.sizes and source not in self.sizes and \
+                    source not in to_read:
+                to_read.append(source)
+        if to_read:
+            self.readers += 1
+            if not self.decoding:
+                self.decoding = True
+                turtle.ontimer(self.decode_preloaded, POLL_INTERVAL)
+            threading.Thread(target=self.read_files, args=(to_read,),
+                             daemon=True).start()
+
+    def read_files(self, images):
+        """Background thread: reads and encodes image files for decoding"""
+        for image in images:
+            try:
+                self.preloaded.put((image, base64.b64encode(read_image(image))))
+            except (OSError, KeyError):
+                pass  # a missing file is reported when the image is actually used
+        self.preloaded.put(None)  # this thread is finished
+
+    def decode_preloaded(self):
+        """Main thread: decodes a few preloaded images, then checks again later"""
+        decoded = 0
+        while decoded < DECODES_PER_TICK and not self.preloaded.empty():
+            item = self.preloaded.get()
+            if item is None:  # a thread has finished reading
+                self.readers -= 1
+            elif item[0] not in self.sizes:
+                image, data = item
+                self.register(image, data)
+                self.sizes.move_to_end(image, last=False)  # not actually used yet
+                decoded += 1
+        if self.readers > 0 or not self.preloaded.empty():
+            turtle.ontimer(self.decode_preloaded, POLL_INTERVAL)
+        else:
+            self.decoding = False
+
+    def __str__(self):
+        """Represent an ImageRegistry by its contents and counts"""
+        return f"{len(self.sizes)} images ({self.memory // 1024} KB, " \
+               f"{len(self.users)} in use); {self.decodes} decodes, {self.hits} hits"
+
+
+images = ImageRegistry()
@@ -4,9 +4,17 @@ CS 5002, Fall 2022
 Tile Game Project
 
 ImageTurtle Class defining turtles that can display images.
-Cannot move or react, but have a defined position and can hide/show themselves.
+Cannot react, but have a defined position and can hide/show themselves.
+Movement is played by the shared Animator, so it never blocks the game; hiding and
+showing wait for any movement already under way.
+ImageTurtles are drawn by a backend (see RenderBackend): by default, with turtles
+borrowed from the shared TurtlePool and returned when they disappear, so that
+replacing ImageTurtles does not add turtles to the screen.
 """
 import turtle
+from Animator import animator
+from RenderTransaction import render
+from RenderBackend import get_backend
 
 
 class ImageTurtle:
@@ -14,19 +22,20 @@ class ImageTurtle:
     A basic class of turtle with a defined image,
     for representing graphical objects
     """
-    def __init__(self, image, x, y, speed=0):
+    def __init__(self, image, x, y, speed=0, backend=None):
         """
         Creates an ImageTurtle object
         :param image: filename of image the turtle should represent graphically
         :param x: x-coordinate of turtle's home position
         :param y: y-coordinate of turtle's home position
+        :param speed: speed of the turtle's movements (0: instant; 1: very slow)
+        :param backend: backend to draw with (default: turtles; see RenderBackend)
         """
-        self.turtle = create_turtle(speed)
+        self.backend = get_backend() if backend is None else backend
+        # a turtle, or an object that acts like one (e.g. a canvas item)
+        self.turtle = self.backend.create(image)
         self.speed = speed
 
-        turtle.addshape(image)
-        self.turtle.shape(image)
-
         self.image = image
         self.x_home = x
         self.y_home = y
@@ -34,11 +43,11 @@ class ImageTurtle:
 
     def hide(self):
         """Hides the ImageTurtle"""
-        self.turtle.hideturtle()
+        animator.run(self.turtle, self.turtle.hideturtle)
 
     def show(self):
         """Shows the ImageTurtle"""
-        self.turtle.showturtle()
+        animator.run(self.turtle, self.turtle.showturtle)
 
     def get_x_home(self) -> int:
         """Returns ImageTurtle's home x position"""
@@ -53,7 +62,7 @@ class ImageTurtle:
         Tells the ImageTurtle to return to its home position
         :return: x coordinate of home position, y coordinate of home position
         """
-        self.turtle.goto(self.get_x_home(), self.get_y_home())
+        animator.slide(self.turtle, self.get_x_home(), self.get_y_home(), self.speed)
         return self.get_x_home(), self.get_y_home()
 
     def get_image(self):
@@ -63,31 +72,31 @@ class ImageTurtle:
     def change_image(self, image):
         """
         Setter for the object's image
-        Also replaces the object's existing turtle with a new one
+        Also replaces the object's existing turtle with one (from its backend)
         on the top layer of the GUI
         """
-        tracer_state = turtle.tracer()  # log current tracer state
-        turtle.tracer(False)
-        self.disappear()  # hide old turtle
-        self.turtle = create_turtle(self.speed)  # create new turtle on top layer
-
-        # set new turtle's image to desired image
-        turtle.addshape(image)
-        self.turtle.shape(image)
-        self.image = image
+        with render:  # the replacement is drawn in a single update
+            self.disappear()  # return old turtle to the backend
+            # get a turtle on the top layer, showing the new image
+            self.turtle = self.backend.create(image)
+            self.image = image
 
-        # move new turtle to old turtle's location
-        self.go_home()
-        turtle.tracer(tracer_state)  # resets tracer state
+            # move new turtle to old turtle's location
+            self.go_home()
 
     def disappear(self):
-        """Hides the tile's turtle object in preparation for replacement"""
-        self.turtle.reset()
-        self.turtle.hideturtle()
+        """
+        Hides the tile's turtle object in preparation for replacement, and returns
+        it to the backend (which also drops its movement and releases its image)
+        """
+        self.backend.remove(self.turtle)
 
 
 def create_turtle(speed=0):
-    """Creates a turtle with default values"""
+    """
+    Creates a turtle with default values
+    Turtles move instantly by default; the Animator plays visible movement
+    """
     new_turtle = turtle.Turtle()
     new_turtle.speed(speed)
     new_turtle.penup()
@@ -5,12 +5,35 @@ Tile Game Project
 
 Leaderboard Class (and Score Class) that can load, keep track of, update,
 and save the high scores from a game.
+
+Scores are kept in ranked order, and a new score's place is found by binary search
+(inserting it there is still O(n); see update_leaderboard).
+Each new score is appended to the leaderboard file as a single line, so the file is
+not rewritten on every win; every so often (and when the file is found out of order)
+the file is compacted back into ranked order on a background thread.
+
+Scores can instead be stored in an SQLite database (see ScoreDatabase), which also
+records the puzzle, board size and move budget of each game, and which several games
+can write to at the same time.
+
+Rank, percentile and per-player bests over every score are kept up to date by a
+ScoreStatistics object.  A score can be given with the recording of its game (see
+GameRecording), and is only accepted if replaying the recording verifies it.
 """
+import threading
+from bisect import bisect_right
+from os import replace
 from file_functions import log_error
+from ScoreDatabase import ScoreDatabase
+from ScoreStatistics import ScoreStatistics
+from replay import verify
 from TextTurtle import TextTurtle
 from gui import BOARD_SIZE, INNER_BORDER, OUTER_BORDER, WINDOW_HEIGHT
 
 LEADERBOARD_FILE = "./Logs/leaderboard.log"
+COMPACT_EVERY = 100  # scores appended to the file between compactions
+FILE_STORAGE = "file"
+SQLITE_STORAGE = "sqlite"
 
 
 class Leaderboard:
@@ -18,9 +41,19 @@ class Leaderboard:
     Leaderboard objects are a datastructure of Score objects in ranked order
     that can provide current rankings, add new rankings, and save to a file.
     """
-    def __init__(self):
-        """Create a new Leaderboard object by reading from the default file"""
+    def __init__(self, storage=None):
+        """
+        Create a new Leaderboard object by reading from the default file
+        :param storage: "file" (default) to keep scores in the leaderboard file, or
+                        "sqlite" to keep them in the score database
+        """
+        self.database = ScoreDatabase() if storage == SQLITE_STORAGE else None
         self.leaderboard = []
+        self.score_values = []  # score of each entry, in the same (ranked) order
+        self.top_10_text = None  # cached result of print_top_10
+        self.lock = threading.Lock()  # guards the file against the compactor
+        self.appended = 0  # scores appended since the file was last compacted
+        self.compacting = None  # scores appended during a compaction, if running
         self.load_leaderboard()
 
         # create & write leaderboard heading
@@ -36,62 +69,149 @@ class Leaderboard:
         """Returns number of items in leaderboard rankings"""
         return len(self.leaderboard)
 
+    def get_statistics(self):
+        """Returns the ScoreStatistics of every score on the leaderboard"""
+        return self.statistics
+
     def print_top_10(self):
         """
         Represents top 10 entries in leaderboard as string
         for printing to graphics screen
+        The string is kept until a new score enters the top 10
         """
-        text_leaderboard = ""
-        for i in range(min(10, len(self.leaderboard))):
-            text_leaderboard += str(self.leaderboard[i]) + "\n"
-        text_leaderboard += ((10 - len(self.leaderboard)) * "\n")
-        return text_leaderboard
+        if self.top_10_text is None:
+            text_leaderboard = ""
+            for i in range(min(10, len(self.leaderboard))):
+                text_leaderboard += str(self.leaderboard[i]) + "\n"
+            text_leaderboard += ((10 - len(self.leaderboard)) * "\n")
+            self.top_10_text = text_leaderboard
+        return self.top_10_text
 
     def load_leaderboard(self):
-        """Reads leaderboard entries from a file"""
+        """
+        Reads leaderboard entries from a file (or the score database)
+        Scores appended since the file was last compacted are put in ranked order
+        (after earlier equal scores), and the file is compacted in the background
+        A new, empty score database is first filled with the file's scores
+        """
+        if self.database is not None:
+            if self.database.count() == 0:  # new database: import the file's scores
+                self.database.import_scores([(each.score(), each.player())
+                                             for each in self.read_leaderboard_file()])
+            scores = [Score(moves, player)
+                      for moves, player in self.database.all_scores()]
+            in_order = True
+        else:
+            scores = self.read_leaderboard_file()
+            in_order = all(scores[i].score() <= scores[i + 1].score()
+                           for i in range(len(scores) - 1))
+            scores.sort(key=Score.score)  # stable: equal scores keep file order
+        self.leaderboard = scores
+        self.score_values = [each.score() for each in scores]
+        self.statistics = ScoreStatistics((each.score(), each.player())
+                                          for each in scores)
+        self.top_10_text = None
+        if not in_order:
+            self.start_compaction()
+
+    def read_leaderboard_file(self):
+        """Returns a list of the Scores in the leaderboard file, in file order"""
         scores = []
         try:
             with open(LEADERBOARD_FILE, mode='r') as in_file:
-                for line in in_file:
+                for line_number, line in enumerate(in_file, start=1):
                     try:
                         score, user = line.strip("\n").split(" : ")
                         scores.append(Score(int(score), user))
                     except ValueError:  # valid scores (if any) will still be read
-                        log_error("Leaderboard file contained invalid data")
+                        log_error("Leaderboard file contained invalid data",
+                                  file=LEADERBOARD_FILE, line=line_number)
         except FileNotFoundError:
             log_error("Leaderboard file could not be found")
-        self.leaderboard = scores
+        return scores
+
+    def update_leaderboard(self, score, user, puzzle=None, board_size=None,
+                           moves_to_win=None, recording=None):
+        """
+        Adds a new score to the leaderboard rankings in the appropriate location.
+        Its place is found by binary search in O(log n); the list inserts are O(n)
+        with a small constant (one memory move of the references after it).
+        :param score: number of moves used to win
+        :param user: player name
+        :param puzzle: name of the puzzle played (recorded by the score database)
+        :param board_size: tiles per side of the board (recorded by the database)
+        :param moves_to_win: moves allowed (recorded by the score database)
+        :param recording: optional GameRecording of the game; if given, the score
+                          is only added if replaying the recording verifies it
+        :return: False if the score was rejected; True otherwise
+        """
+        if recording is not None and not verify(recording, score):
+            log_error("Score rejected: its recording does not verify the game",
+                      player=user, score=score, puzzle=puzzle)
+            return False
+        new_score = Score(score, user)
+        # binary search for the place in rankings, after any equal scores
+        i = bisect_right(self.score_values, score)
+        self.score_values.insert(i, score)
+        self.leaderboard.insert(i, new_score)
+        self.statistics.add(score, user)
+        if self.database is not None:
+            self.database.add_score(score, user, puzzle, board_size, moves_to_win)
+        else:
+            self.append_score(new_score)
+        if i < 10:  # top 10 changed
+            self.top_10_text = None
+            self.leaderboard_gui.clear()
+            self.leaderboard_gui.write(self.print_top_10(), 18)  # update screen
+        return True
+
+    def append_score(self, new_score):
+        """Appends one new score to the leaderboard file"""
+        with self.lock:
+            with open(LEADERBOARD_FILE, mode='a') as out_file:
+                out_file.write(f"{str(new_score)}\n")
+            if self.compacting is not None:  # also add it to the compacted file
+                self.compacting.append(new_score)
+        self.appended += 1
+        if self.appended >= COMPACT_EVERY:
+            self.start_compaction()
 
-    def update_leaderboard(self, score, user):
-        """Adds a new score to the leaderboard rankings in the appropriate location"""
-        new_scoreboard = []
-        for i in range(self.get_leaderboard_length()):
-            # check new score against each recorded score
-            if score < (self.leaderboard[i]).score():  # found place in rankings
-                # keep high scores
-                for each in self.leaderboard[:i]:
-                    new_scoreboard.append(each)
-                # insert new score
-                new_scoreboard.append(Score(score, user))
-                # retain remaining scores
-                for each in self.leaderboard[i:]:
-                    new_scoreboard.append(each)
-                self.leaderboard = new_scoreboard
-                self.save_leaderboard()
-                self.leaderboard_gui.clear()
-                self.leaderboard_gui.write(self.print_top_10(), 18)  # update screen
-                return None  # return after inserting new score
-        # leaderboard was empty, or new score is more moves than previous largest
-        self.leaderboard.append(Score(score, user))
-        self.save_leaderboard()
-        self.leaderboard_gui.clear()
-        self.leaderboard_gui.write(self.print_top_10(), 18)  # update screen
-
-    def save_leaderboard(self):
-        """Saves leaderboard rankings to file"""
-        with open(LEADERBOARD_FILE, mode='w') as out_file:
-            for each in self.leaderboard:
-                out_file.write(f"{str(each)}\n")
+    def start_compaction(self):
+        """Compacts the leaderboard file on a background thread (if not already)"""
+        with self.lock:
+            if self.compacting is not None:
+                return None
+            self.compacting = []
+            snapshot = list(self.leaderboard)
+        self.appended = 0
+        threading.Thread(target=self.save_leaderboard, args=(snapshot,),
+                         daemon=True).start()
+
+    def save_leaderboard(self, scores=None):
+        """
+        Saves leaderboard rankings to file, in ranked order
+        The rankings are written to a temporary file that then replaces the
+        leaderboard file, so the file is never left half-written; scores appended
+        while it was being written are carried over
+        :param scores: list of Scores in ranked order (default: current rankings)
+        """
+        if scores is None:
+            scores = list(self.leaderboard)
+        temporary = LEADERBOARD_FILE + ".tmp"
+        try:
+            with open(temporary, mode='w') as out_file:
+                for each in scores:
+                    out_file.write(f"{str(each)}\n")
+            with self.lock:
+                with open(temporary, mode='a') as out_file:
+                    for each in self.compacting or []:
+                        out_file.write(f"{str(each)}\n")
+                replace(temporary, LEADERBOARD_FILE)
+        except OSError:
+            log_error("Leaderboard file could not be compacted")
+        finally:
+            with self.lock:
+                self.compacting = None
 
 class Score:
     """
@@ -4,67 +4,153 @@ CS 5002, Fall 2022
 Tile Game Project
 
 LoadMenu class contains a dictionary with all found valid puzzles.
-It also contains a list of Buttons with thumbnails of all found valid puzzles.
-These can be clicked on when the LoadMenu is shown on a screen, and which
-thumbnail is selected is recorded.
+It shows their thumbnails as Buttons, one page of 9 at a time, with text "< Prev" and
+"Next >" links to turn the page.  These can be clicked on when the LoadMenu is shown on
+a screen, and which thumbnail is selected is recorded.
+
+Thumbnail Buttons are only created for the page being shown, the first time it is
+shown, and are removed when the page is turned.  The tiles of the shown puzzles, and
+the next page's thumbnails, are preloaded in the background so that choosing a puzzle
+or turning the page does not wait for decoding.
+
+The shown thumbnails are kept in a WidgetRegistry, each with the key of its puzzle, so
+that a click finds the clicked thumbnail, and its puzzle, directly.
 """
-import turtle
 from Button import Button
+from TextTurtle import TextTurtle
+from RenderTransaction import render
+from ImageRegistry import images
+from WidgetRegistry import WidgetRegistry
+from gui import OUTER_BORDER, WINDOW_HEIGHT
 from file_functions import *
 
+PAGE_SIZE = 9  # thumbnails per page, in a 3x3 grid
+PAGE_COLUMNS = 3
+PAGE_TEXT_Y = WINDOW_HEIGHT - OUTER_BORDER - 35  # baseline of the page links
+PREV_X = OUTER_BORDER + 20  # left edge of each page link
+PAGE_X = OUTER_BORDER + 140
+NEXT_X = OUTER_BORDER + 330
+LINK_WIDTH = 90  # click region of a page link, right and up from its baseline
+LINK_HEIGHT = 35
+
 
 class LoadMenu:
     """
-    LoadMenu creates a dictionary of all found valid puzzles, and a list of
-    Buttons containing their thumbnails.  The menu and these buttons can be toggled
-    to be shown or hidden. When shown, selection of a button can be recorded.
+    LoadMenu creates a dictionary of all found valid puzzles, and shows Buttons
+    containing their thumbnails one page at a time.  The menu and these buttons can
+    be toggled to be shown or hidden. When shown, selection of a button can be
+    recorded, and the page can be turned.
     """
     def __init__(self):
         """
-        Creates a new LoadMenu class. Checks the game directory for valid puzzles,
-        loads any found into its puzzle_directory dictionary, and creates a list
-        of Buttons with the thumbnail images for each valid puzzle.
+        Creates a new LoadMenu class. Checks the game directory for valid puzzles
+        and loads any found into its puzzle_directory dictionary.  No thumbnails
+        are created until the menu is shown.
         """
         self.puzzle_selection = None
         self.menu_is_shown = False
-        self.too_many_puzzles = False
 
-        self.puzzle_directory, thumbnails = load_all_puzzles()
-        self.thumbnail_turtles = self.create_thumbnails(thumbnails)
+        self.puzzle_directory, _ = load_all_puzzles()
+        self.puzzle_keys = list(self.puzzle_directory)  # in menu order
+        self.page = 0
+        self.thumbnail_turtles = []  # Buttons of the page being shown (once created)
+        self.widgets = WidgetRegistry()  # shown Buttons -> key of their puzzle
+        self.page_text = None  # TextTurtle for the page links (once shown)
+
+    def page_count(self):
+        """Returns the number of pages of thumbnails (at least 1)"""
+        return max(1, -(-len(self.puzzle_keys) // PAGE_SIZE))
+
+    def page_keys(self, page):
+        """Returns the keys of the puzzles shown on a page"""
+        return self.puzzle_keys[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+    def page_thumbnails(self, page):
+        """Returns the thumbnail image files shown on a page"""
+        return [self.puzzle_directory[key]['thumbnail'] for key in self.page_keys(page)]
 
     def create_thumbnails(self, list_of_images):
         """
         Function -- create_thumbnails
-            Takes a list of image files and returns a list of Button turtle objects
-            displaying those images
+            Takes a list of image files (one page) and returns a list of Button
+            turtle objects displaying those images, hidden
         :param list_of_images: list of image file names to assign to Button turtle objects
         :return: list of newly created turtle objects with assigned images
         """
         turtle_list = []
-        if len(list_of_images) > 9:
-            self.too_many_puzzles = True
-            number_to_display = 9
-            log_error(f"More than 9 puzzle files found!")
-        else:
-            self.too_many_puzzles = False
-            number_to_display = len(list_of_images)
-        for i in range(number_to_display):
-            t = Button(list_of_images[i], 120 + 150 * (i % 3),
-                       120 + 150 * (i // 3), 150, 150)
+        for i in range(len(list_of_images)):
+            t = Button(list_of_images[i], 120 + 150 * (i % PAGE_COLUMNS),
+                       120 + 150 * (i // PAGE_COLUMNS), 150, 150)
             t.hide()
             turtle_list.append(t)
         return turtle_list
 
-    def too_many(self):
+    def turn_page(self, page):
         """
-        Returns whether more puzzles were found than can be displayed as thumbnails
-        :return: boolean: True if directory contains more than 9 puzzles, False otherwise
+        Replaces the shown thumbnails with those of another page
+        :param page: page number (0-based); ignored if there is no such page
         """
-        return self.too_many_puzzles
+        if not 0 <= page < self.page_count():
+            return None
+        with render:
+            for each in self.thumbnail_turtles:
+                each.disappear()  # its turtle goes back to the pool
+            self.widgets.clear()
+            self.page = page
+            self.thumbnail_turtles = self.create_thumbnails(self.page_thumbnails(page))
+            for each, key in zip(self.thumbnail_turtles, self.page_keys(page)):
+                self.widgets.add(each, key)
+            if self.menu_is_shown:
+                for each in self.thumbnail_turtles:
+                    each.show()
+            self.write_page_links()
+        self.preload()
+
+    def preload(self):
+        """Preloads the shown puzzles' tiles and the next page's thumbnails"""
+        images.preload(self.puzzle_images() + self.page_thumbnails(self.page + 1))
+
+    def write_page_links(self):
+        """Writes the page number, and links to the pages before and after it"""
+        if self.page_text is None:
+            self.page_text = TextTurtle(PREV_X, PAGE_TEXT_Y, "black")
+        self.page_text.clear()
+        if not self.menu_is_shown or self.page_count() == 1:
+            return None
+        if self.page > 0:
+            self.page_text.write("< Prev", style='bold')
+        self.page_text.turtle.goto(PAGE_X, PAGE_TEXT_Y)
+        self.page_text.write(f"Page {self.page + 1} of {self.page_count()}")
+        if self.page < self.page_count() - 1:
+            self.page_text.turtle.goto(NEXT_X, PAGE_TEXT_Y)
+            self.page_text.write("Next >", style='bold')
+        self.page_text.turtle.goto(PREV_X, PAGE_TEXT_Y)
+
+    def page_link(self, x, y):
+        """
+        Returns the page a click on a page link turns to
+        :return: page number; None if the click was not on a shown page link
+        """
+        if not PAGE_TEXT_Y - LINK_HEIGHT < y < PAGE_TEXT_Y + 5:
+            return None
+        if PREV_X < x < PREV_X + LINK_WIDTH and self.page > 0:
+            return self.page - 1
+        if NEXT_X < x < NEXT_X + LINK_WIDTH and self.page < self.page_count() - 1:
+            return self.page + 1
+        return None
+
+    def puzzle_images(self):
+        """Returns a list of the tile image files of every puzzle on the shown page"""
+        return [image for key in self.page_keys(self.page)
+                for image in self.puzzle_directory[key]['tile_icons']]
+
+    def widget_at(self, x, y):
+        """Returns the shown thumbnail Button at a point on the screen, if any"""
+        return self.widgets.widget_at(x, y)
 
     def register_click(self, x, y):
         """
-        Checks each displayed puzzle thumbnail Button to determine if it was clicked
+        Finds the displayed puzzle thumbnail Button (if any) that was clicked
         If a thumbnail ws clicked, the puzzle selection is set to the corresponding puzzle
         The "new thumbnail" animation plays, moving the button to the thumbnail position
         The menu is hidden and the screen is frozen to prepare for a new puzzle
@@ -72,27 +158,25 @@ class LoadMenu:
         :param y: y-coordinate of screen click
         :return: None
         """
-        for each in self.thumbnail_turtles:
-            if each.register_click(x, y):
-                each.state(False)
-                # find the puzzle with the selected thumbnail; this is the selection
-                thumbnail = each.get_image()
-                for puzzle in self.puzzle_directory:
-                    if self.puzzle_directory[puzzle]["thumbnail"] == thumbnail:
-                        self.puzzle_selection = puzzle
-
-                # hide the other options and move the button to the thumbnail position
-                turtle.tracer(False)
-                self.show_menu(False)  # hide menu
-                each.show()  # re-show selected thumbnail
-                turtle.tracer(True)
-                each.use_as_new_thumbnail()
-
-                # freeze the screen and move the button back to its menu location
-                # the button will be replaced by a newly created thumbnail tile
-                turtle.tracer(False)
-                each.go_home()
-                break  # do not continue iterating after finding the selected button
+        page = self.page_link(x, y)
+        if page is not None:
+            self.turn_page(page)
+            return None
+        each = self.widget_at(x, y)
+        if each is None:
+            return None
+        # the button was registered with the key of its puzzle; this is the selection
+        self.puzzle_selection = self.widgets.value(each)
+
+        # hide the other options and move the button to the thumbnail position
+        with render:
+            self.show_menu(False)  # hide menu
+            each.show()  # re-show selected thumbnail
+        each.use_as_new_thumbnail()  # animated without blocking
+
+        # once the animation ends, move the button back to its menu location
+        # the button will be replaced by a newly created thumbnail tile
+        each.go_home()
 
     def selection(self):
         """
@@ -115,14 +199,21 @@ class LoadMenu:
     def show_menu(self, boolean=None):
         """
         Get and set visibility of the LoadMenu object
+        The first time the menu is shown, the thumbnails of its first page are created
         :param boolean: Optional; set menu visibility to True (shown) or False (hidden)
         :return: boolean value reflecting menu visibility: True if shown, False if hidden
         """
         if boolean is not None:
             self.menu_is_shown = boolean
+            if boolean and not self.thumbnail_turtles and self.puzzle_keys:
+                self.turn_page(self.page)  # first time shown: create this page
+            elif boolean:
+                self.preload()
             for each in self.thumbnail_turtles:
                 if boolean:
                     each.show()
                 else:
                     each.hide()
+            if self.page_text is not None or boolean:
+                self.write_page_links()
         return self.menu_is_shown
@@ -0,0 +1,125 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+PuzzleIndex Class keeps the checked data of every valid puzzle on disk between runs, so
+that unchanged puzzles are not parsed and checked again each time the game starts.
+
+Each puzzle's entry is stamped with the size and modification time of its .puz file,
+of every file it uses (thumbnail, tile images or sprite sheet), and of the bundle file
+(packing a bundle changes where puzzles are read from).  An entry is only used while
+every stamp still matches; a puzzle whose files have changed is loaded (and checked)
+again, and only its entry is replaced.
+Checking the stamps takes one os.stat per file, with no reading or parsing.
+"""
+import json
+from os import path, makedirs, replace, stat
+from sprite_sheet import source_file
+from puzzle_bundle import BUNDLE_FILE, IMAGE_PREFIX, is_bundle_image
+
+INDEX_FILE = "./Databases/puzzle_index.json"
+VERSION = 1
+
+
+class PuzzleIndex:
+    """
+    An on-disk cache of checked puzzle data, keyed by .puz filename.  Counts the
+    puzzles it served (hits) and the puzzles that had to be loaded again (misses).
+    """
+    def __init__(self, filename=INDEX_FILE):
+        """
+        Reads the index file, if there is a valid one
+        :param filename: path of the index file
+        """
+        self.filename = filename
+        self.entries = {}  # .puz filename -> {'stamps': {...}, 'metadata': {...}}
+        self.changed = False
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(filename, mode='r') as in_file:
+                contents = json.load(in_file)
+            if contents.get('version') == VERSION:
+                self.entries = contents['entries']
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.entries = {}  # no index yet, or unreadable: every puzzle is loaded
+
+    def lookup(self, puzzle_file, key):
+        """
+        Returns a puzzle's checked data if none of its files have changed
+        :param puzzle_file: path of the .puz file
+        :param key: .puz filename the entry is stored under
+        :return: dictionary of puzzle data (see load_puzzle); None if there is no
+                 entry, or any of the puzzle's files have changed
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry['stamps'] != file_stamps(puzzle_file,
+                                                           entry['metadata']):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry['metadata']
+
+    def store(self, puzzle_file, key, metadata):
+        """
+        Records a puzzle's checked data, stamped with its files' current state
+        :param puzzle_file: path of the .puz file
+        :param key: .puz filename to store the entry under
+        :param metadata: dictionary of puzzle data (see load_puzzle)
+        """
+        self.entries[key] = {'stamps': file_stamps(puzzle_file, metadata),
+                             'metadata': metadata}
+        self.changed = True
+
+    def keep_only(self, keys):
+        """Drops the entries of puzzles that no longer exist"""
+        for key in list(self.entries):
+            if key not in keys:
+                del self.entries[key]
+                self.changed = True
+
+    def save(self):
+        """Writes the index file, if any entry has changed"""
+        if not self.changed:
+            return None
+        try:
+            makedirs(path.dirname(self.filename), exist_ok=True)
+            temporary = self.filename + ".tmp"
+            with open(temporary, mode='w') as out_file:
+                json.dump({'version': VERSION, 'entries': self.entries}, out_file)
+            replace(temporary, self.filename)
+            self.changed = False
+        except OSError:
+            pass  # the index is only a cache; puzzles are loaded again next time
+
+    def __str__(self):
+        """Represent a PuzzleIndex by its counts"""
+        return f"{len(self.entries)} puzzles indexed; {self.hits} hits, " \
+               f"{self.misses} misses"
+
+
+def file_stamps(puzzle_file, metadata):
+    """
+    Returns the size and modification time of a puzzle's .puz file, every file it
+    uses (including the files that bundled images were packed from), and the
+    bundle file
+    :param puzzle_file: path of the .puz file
+    :param metadata: dictionary of puzzle data (see load_puzzle)
+    :return: dictionary of file path -> [size, mtime in ns], or None if missing
+    """
+    files = [puzzle_file, BUNDLE_FILE]
+    for image in [metadata['thumbnail']] + metadata['tile_icons']:
+        if is_bundle_image(image):  # also stamp the file it was packed from
+            image = image[len(IMAGE_PREFIX):]
+        image = source_file(image)
+        if image not in files:
+            files.append(image)
+    stamps = {}
+    for each in files:
+        try:
+            status = stat(each)
+            stamps[each] = [status.st_size, status.st_mtime_ns]
+        except OSError:
+            stamps[each] = None
+    return stamps
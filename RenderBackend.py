@@ -0,0 +1,114 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Contains the backends that ImageTurtles (and so Tiles) are drawn with:
+    > TurtleBackend: each image is a turtle from the TurtlePool (the default)
+    > CanvasBackend: each image is a plain Tk canvas image item (a CanvasSprite),
+      moved with canvas.coords
+
+A turtle carries a pen, an undo buffer and shape state, and every screen update
+redraws every turtle; a canvas item is just a positioned image, only touched when it
+changes.  Large boards (10x10, 20x20) therefore use the canvas backend.
+
+Both backends create objects that act like the parts of a turtle that ImageTurtle, the
+Animator and the ImageRegistry use: position, goto, hideturtle, showturtle, isvisible.
+"""
+import turtle
+from Animator import animator
+from ImageRegistry import images
+from TurtlePool import pool
+
+CANVAS_MIN_COLUMNS = 6  # boards at least this wide use the canvas backend by default
+
+
+class TurtleBackend:
+    """Draws each image with a turtle borrowed from the TurtlePool"""
+    name = "turtle"
+
+    def create(self, image):
+        """Returns a shown turtle displaying an image, on the top layer"""
+        new_turtle = pool.checkout()
+        images.use(new_turtle, image)
+        return new_turtle
+
+    def remove(self, a_turtle):
+        """Hides a turtle and returns it to the TurtlePool"""
+        pool.checkin(a_turtle)
+
+
+class CanvasBackend:
+    """Draws each image as a plain canvas image item"""
+    name = "canvas"
+
+    def create(self, image):
+        """Returns a shown CanvasSprite displaying an image, on the top layer"""
+        return CanvasSprite(image)
+
+    def remove(self, sprite):
+        """Deletes a CanvasSprite's canvas item"""
+        sprite.delete()
+
+
+class CanvasSprite:
+    """
+    A canvas image item that can be positioned, moved, hidden and shown in the
+    screen's world coordinates, like a turtle
+    """
+    def __init__(self, image):
+        """
+        Creates a canvas image item (on the top layer) showing an image
+        :param image: filename of a GIF image
+        """
+        self.screen = turtle.Screen()
+        self.x = 0
+        self.y = 0
+        self.visible = True
+        self.item = self.screen.cv.create_image(0, 0, image=images.acquire(self, image))
+
+    def position(self):
+        """Returns the sprite's (x, y) position in world coordinates"""
+        return self.x, self.y
+
+    def goto(self, x, y):
+        """Moves the sprite to (x, y) in world coordinates"""
+        self.x = x
+        self.y = y
+        # world to canvas coordinates, as turtle itself draws images
+        self.screen.cv.coords(self.item, x * self.screen.xscale, -y * self.screen.yscale)
+
+    def hideturtle(self):
+        """Hides the sprite"""
+        self.visible = False
+        self.screen.cv.itemconfigure(self.item, state='hidden')
+
+    def showturtle(self):
+        """Shows the sprite"""
+        self.visible = True
+        self.screen.cv.itemconfigure(self.item, state='normal')
+
+    def isvisible(self):
+        """Returns True if the sprite is shown"""
+        return self.visible
+
+    def delete(self):
+        """Removes the sprite's canvas item, movement and image for good"""
+        animator.forget(self)
+        images.release(self)
+        self.screen.cv.delete(self.item)
+
+
+BACKENDS = {TurtleBackend.name: TurtleBackend(), CanvasBackend.name: CanvasBackend()}
+
+
+def get_backend(name=None, columns=None):
+    """
+    Returns a backend
+    :param name: "turtle" or "canvas"; if None, the backend is chosen by board width
+    :param columns: number of columns on the board being drawn (used if name is None)
+    """
+    if name is None:
+        name = CanvasBackend.name if columns is not None and \
+            columns >= CANVAS_MIN_COLUMNS else TurtleBackend.name
+    return BACKENDS[name]
@@ -0,0 +1,91 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+RenderTransaction Class groups drawing into a single screen update.  The game runs
+with turtle tracing off, so drawing is not shown until the screen is updated; any code
+that draws does so inside a transaction:
+
+    with render:
+        ...draw...
+
+Transactions nest: only the outermost one updates the screen, when it ends.  An event
+(a click, an animation frame, a hint arriving) is one outermost transaction, so it
+costs exactly one redraw no matter how many objects it changes.  Tracing is turned off
+(turtle.tracer) for the length of a transaction and restored when it ends, even if
+drawing raised an exception.  The redraws each event causes are counted: the one made
+when the outermost transaction ends, and any asked for part-way through with update().
+A single RenderTransaction is shared by the whole game: "render".
+"""
+import turtle
+from collections import deque
+
+HISTORY_LENGTH = 100  # number of recent events whose redraw counts are kept
+
+
+class RenderTransaction:
+    """
+    A nesting context manager that updates the screen once, at the end of the
+    outermost transaction, and counts the redraws of each event
+    """
+    def __init__(self):
+        """Creates a RenderTransaction with no transaction open"""
+        self.depth = 0
+        self.tracing = 0  # tracer setting to restore when the transaction ends
+        self.redraws = 0  # redraws so far in the current event
+        self.history = deque(maxlen=HISTORY_LENGTH)  # redraws of recent events
+        self.events = 0
+        self.total_redraws = 0
+
+    def __enter__(self):
+        """
+        Opens a transaction; opening the outermost one starts a new event, and stops
+        turtle redrawing
+        """
+        if self.depth == 0:
+            self.redraws = 0
+            self.tracing = turtle.tracer()
+            turtle.tracer(0)
+        self.depth += 1
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        """Closes a transaction; closing the outermost one updates the screen"""
+        self.depth -= 1
+        if self.depth == 0:
+            turtle.tracer(self.tracing)
+            if self.tracing:
+                self.count_redraw()  # turning tracing back on redraws the screen
+            else:
+                self.update()
+            self.history.append(self.redraws)
+            self.events += 1
+        return False  # exceptions are not suppressed
+
+    def update(self):
+        """Redraws the screen now (even part-way through an event), counting it"""
+        turtle.update()
+        self.count_redraw()
+
+    def count_redraw(self):
+        """Counts one redraw of the screen towards the current event"""
+        self.redraws += 1
+        self.total_redraws += 1
+
+    def last_redraws(self):
+        """Returns the number of redraws caused by the most recent event"""
+        return self.history[-1] if self.history else 0
+
+    def average_redraws(self):
+        """Returns the average number of redraws of recent events"""
+        return sum(self.history) / len(self.history) if self.history else 0
+
+    def __str__(self):
+        """Represent a RenderTransaction by its redraw counts"""
+        return f"{self.events} events, {self.total_redraws} redraws; " \
+               f"last event {self.last_redraws()}, " \
+               f"recent average {self.average_redraws():.2f}"
+
+
+render = RenderTransaction()
@@ -0,0 +1,166 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+ScoreDatabase Class stores the leaderboard in an SQLite database instead of a text
+file.  Each score records the puzzle played, its board size (tiles per side), the
+player, the moves used and the moves allowed (moves_to_win), and when it was played,
+so that scores can be ranked among games of the same puzzle and move budget.
+
+The database uses write-ahead logging (WAL), so several games on the same machine can
+add scores at the same time: each score is added in its own short transaction, and a
+game that finds the database busy waits for the other game's write to finish.
+Indexes on puzzle, board size, budget, player and time keep top-N, personal-best and
+percentile queries fast as the table grows.  Earlier scores are imported into an empty
+database in a single BEGIN IMMEDIATE transaction, so that two games starting at once
+cannot both import them.
+"""
+import sqlite3
+import time
+
+DATABASE_FILE = "./Logs/leaderboard.db"
+BUSY_TIMEOUT = 5.0  # seconds to wait for another game's write to finish
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS scores (
+           id INTEGER PRIMARY KEY,
+           puzzle TEXT,
+           board_size INTEGER,
+           player TEXT NOT NULL,
+           moves INTEGER NOT NULL,
+           moves_to_win INTEGER,
+           played REAL NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS scores_by_moves ON scores (moves)",
+    "CREATE INDEX IF NOT EXISTS scores_by_puzzle ON scores (puzzle, board_size, moves)",
+    "CREATE INDEX IF NOT EXISTS scores_by_budget ON scores (moves_to_win, moves)",
+    "CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, moves)",
+    "CREATE INDEX IF NOT EXISTS scores_by_time ON scores (played)",
+)
+
+
+class ScoreDatabase:
+    """
+    An SQLite table of scores.  Queries can be limited to one puzzle, board size
+    and/or move budget; a limit left as None includes every game.
+    """
+    def __init__(self, filename=DATABASE_FILE):
+        """
+        Opens (creating if needed) a score database
+        :param filename: path of the database file
+        """
+        self.filename = filename
+        self.connection = sqlite3.connect(filename, timeout=BUSY_TIMEOUT)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")  # safe with WAL
+        with self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+    def add_score(self, moves, player, puzzle=None, board_size=None,
+                  moves_to_win=None, played=None):
+        """
+        Records a score
+        :param moves: number of moves used to win
+        :param player: player name
+        :param puzzle: name of the puzzle played
+        :param board_size: number of tiles per side of the board
+        :param moves_to_win: number of moves that were allowed
+        :param played: time the game was won (seconds since the epoch; default now)
+        """
+        if played is None:
+            played = time.time()
+        with self.connection:  # one short transaction per score
+            self.connection.execute(
+                "INSERT INTO scores (puzzle, board_size, player, moves, moves_to_win, "
+                "played) VALUES (?, ?, ?, ?, ?, ?)",
+                (puzzle, board_size, player, moves, moves_to_win, played))
+
+    def import_scores(self, scores):
+        """
+        Records earlier scores (such as the leaderboard file's), if the database has
+        none.  The check and the inserts are one BEGIN IMMEDIATE transaction: another
+        game importing at the same time waits, then finds the scores already there.
+        :param scores: list of (moves, player), in ranked order
+        :return: True if the scores were imported; False if there already were scores
+        """
+        self.connection.execute("BEGIN IMMEDIATE")  # take the write lock first
+        try:
+            if self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]:
+                self.connection.rollback()
+                return False
+            played = time.time()
+            self.connection.executemany(
+                "INSERT INTO scores (player, moves, played) VALUES (?, ?, ?)",
+                [(player, moves, played) for moves, player in scores])
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            raise
+        return True
+
+    def all_scores(self):
+        """Returns every (moves, player), best first (equal scores oldest first)"""
+        return self.connection.execute(
+            "SELECT moves, player FROM scores ORDER BY moves, id").fetchall()
+
+    def top_scores(self, count=10, puzzle=None, board_size=None, moves_to_win=None):
+        """
+        Returns the best scores
+        :param count: number of scores to return
+        :return: list of (moves, player), best first
+        """
+        where, values = conditions(puzzle, board_size, moves_to_win)
+        return self.connection.execute(
+            f"SELECT moves, player FROM scores {where} ORDER BY moves, id LIMIT ?",
+            values + [count]).fetchall()
+
+    def personal_best(self, player, puzzle=None, board_size=None, moves_to_win=None):
+        """
+        Returns a player's best (fewest moves) score
+        :return: number of moves; None if the player has no scores
+        """
+        where, values = conditions(puzzle, board_size, moves_to_win, player)
+        return self.connection.execute(
+            f"SELECT MIN(moves) FROM scores {where}", values).fetchone()[0]
+
+    def percentile(self, moves, puzzle=None, board_size=None, moves_to_win=None):
+        """
+        Returns the percentage of recorded scores that a score is at least as good as
+        :param moves: number of moves of the score
+        :return: percentage (0-100); None if there are no recorded scores
+        """
+        where, values = conditions(puzzle, board_size, moves_to_win)
+        total, not_better = self.connection.execute(
+            f"SELECT COUNT(*), COUNT(CASE WHEN moves >= ? THEN 1 END) FROM scores "
+            f"{where}", [moves] + values).fetchone()
+        if total == 0:
+            return None
+        return 100 * not_better / total
+
+    def count(self, puzzle=None, board_size=None, moves_to_win=None):
+        """Returns the number of recorded scores"""
+        where, values = conditions(puzzle, board_size, moves_to_win)
+        return self.connection.execute(
+            f"SELECT COUNT(*) FROM scores {where}", values).fetchone()[0]
+
+    def close(self):
+        """Closes the database"""
+        self.connection.close()
+
+
+def conditions(puzzle=None, board_size=None, moves_to_win=None, player=None):
+    """
+    Builds the WHERE clause that limits a query to some games
+    :return: (WHERE clause, or "" for every game; list of values for its parameters)
+    """
+    clauses = []
+    values = []
+    for column, value in (("puzzle", puzzle), ("board_size", board_size),
+                          ("moves_to_win", moves_to_win), ("player", player)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            values.append(value)
+    if not clauses:
+        return "", values
+    return "WHERE " + " AND ".join(clauses), values
@@ -0,0 +1,124 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+ScoreStatistics Class answers rank, percentile and histogram questions about every
+recorded score, and keeps each player's best score.
+
+Scores are small whole numbers (moves used), so the statistics keep a count of scores
+for each possible value in a Fenwick (binary indexed) tree: both adding a score and
+counting the scores up to a value take O(log m) steps, where m is the largest score,
+however many scores are stored.  The tree grows when a larger score is added.
+"""
+
+INITIAL_CAPACITY = 256  # score values the tree holds before it first grows
+
+
+class ScoreStatistics:
+    """
+    Counts of recorded scores by value (fewer moves is better), kept in a Fenwick
+    tree, and each player's best score
+    """
+    def __init__(self, scores=()):
+        """
+        Creates statistics of some scores
+        :param scores: iterable of (score, player) pairs
+        """
+        self.counts = [0] * INITIAL_CAPACITY  # number of scores of each value
+        self.tree = [0] * (INITIAL_CAPACITY + 1)  # Fenwick tree over counts, 1-based
+        self.total = 0
+        self.bests = {}  # player -> best (lowest) score
+        for score, player in scores:
+            self.counts_add(score)
+            self.player_add(score, player)
+        self.build_tree()
+
+    def add(self, score, player):
+        """
+        Records one new score
+        :param score: number of moves used
+        :param player: player name
+        """
+        if score >= len(self.counts):
+            self.counts_add(score)  # grows the counts; the tree is rebuilt to match
+            self.build_tree()
+        else:
+            self.counts[score] += 1
+            self.total += 1
+            position = score + 1
+            while position < len(self.tree):
+                self.tree[position] += 1
+                position += position & -position
+        self.player_add(score, player)
+
+    def count_up_to(self, score):
+        """Returns the number of recorded scores less than or equal to a score"""
+        position = min(score + 1, len(self.tree) - 1)
+        count = 0
+        while position > 0:
+            count += self.tree[position]
+            position -= position & -position
+        return count
+
+    def rank(self, score):
+        """Returns a score's rank: 1 + the number of recorded scores better than it"""
+        return 1 + self.count_up_to(score - 1)
+
+    def percentile(self, score):
+        """
+        Returns the percentage of recorded scores that a score is at least as good as
+        :return: percentage (0-100); None if no scores are recorded
+        """
+        if self.total == 0:
+            return None
+        return 100 * (self.total - self.count_up_to(score - 1)) / self.total
+
+    def histogram(self, bin_width=10):
+        """
+        Returns the number of recorded scores in each range of values
+        :param bin_width: number of score values in each range
+        :return: list of (lowest score, highest score, count), lowest range first,
+                 up to the range holding the largest recorded score
+        """
+        bins = []
+        below = 0
+        low = 0
+        while below < self.total:
+            counted = self.count_up_to(low + bin_width - 1)
+            bins.append((low, low + bin_width - 1, counted - below))
+            below = counted
+            low += bin_width
+        return bins
+
+    def personal_best(self, player):
+        """Returns a player's best score; None if the player has no scores"""
+        return self.bests.get(player)
+
+    def get_total(self):
+        """Returns the number of recorded scores"""
+        return self.total
+
+    def counts_add(self, score):
+        """Adds a score to the counts only (growing them if needed)"""
+        while score >= len(self.counts):
+            self.counts += [0] * len(self.counts)
+        self.counts[score] += 1
+        self.total += 1
+
+    def player_add(self, score, player):
+        """Updates a player's best score"""
+        if player not in self.bests or score < self.bests[player]:
+            self.bests[player] = score
+
+    def build_tree(self):
+        """Rebuilds the Fenwick tree from the counts, in O(m) steps"""
+        self.tree = [0] + self.counts
+        for position in range(1, len(self.tree)):
+            parent = position + (position & -position)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[position]
+
+    def __str__(self):
+        """Represent ScoreStatistics by their size"""
+        return f"{self.total} scores from {len(self.bests)} players"
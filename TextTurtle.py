@@ -5,8 +5,8 @@ Tile Game Project
 
 TextTurtle Class defining turtles that can write text at their location.
 """
-import turtle
 from ImageTurtle import create_turtle
+from RenderTransaction import render
 
 
 class TextTurtle:
@@ -47,11 +47,9 @@ class TextTurtle:
         :param numerator: string representing numerator of fraction (moves used)
         :param denominator: string representing denominator of fraction (max moves)
         """
-        tracer_status = turtle.tracer()
-        turtle.tracer(False)
-        self.clear()
-        self.write(f"Moves: {numerator} / {denominator}", style='bold')
-        turtle.tracer(tracer_status)
+        with render:  # clear and rewrite in a single update
+            self.clear()
+            self.write(f"Moves: {numerator} / {denominator}", style='bold')
 
     def clear(self):
         """Clears text previously written by the turtle"""
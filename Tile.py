@@ -5,25 +5,30 @@ Tile Game Project
 
 Tile Class defining turtles that can display images, and move around on a game grid.
 Can move, go home, know where they are, and know if they are home.
+A Tile's location changes as soon as it is moved; its turtle catches up on screen.
+Screen positions are looked up in its board's BoardGeometry.
 """
 from ImageTurtle import ImageTurtle
-from gui import calculate_tile_border, calculate_tile_gap
+from Animator import animator, slide_frames
 
 
 class Tile(ImageTurtle):
     """Tiles are ImageTurtles that can move around on a game grid"""
-    def __init__(self, image, x, y, tile_size):
+    def __init__(self, image, x, y, geometry, backend=None):
         """
         Creates a Tile object with a defined image, position, and size
         :param image: string of filename from which to load image
         :param x: x-position of tile - initially used for both current and home
         :param y: y-position of tile - initially used for both current and home
-        :param tile_size: size of the tile; used for proper scaling
+        :param geometry: BoardGeometry of the tile's board (gives its size and
+                         the screen position of each grid cell)
+        :param backend: backend to draw with (default: turtles; see RenderBackend)
         """
         self.x_location = x
         self.y_location = y
-        self.width_of_tile = tile_size
-        super().__init__(image, x, y, speed=3)
+        self.geometry = geometry
+        super().__init__(image, x, y, backend=backend)  # placed instantly
+        self.speed = 3  # later moves slide
         self.is_blank = False
 
     def blank(self, blank=None):
@@ -39,7 +44,11 @@ class Tile(ImageTurtle):
 
     def change_speed(self, speed):
         """Set's the Tile's turtle speed"""
-        self.turtle.speed(speed)
+        self.speed = speed
+
+    def move_frames(self):
+        """Returns the number of frames that a move of one cell takes on screen"""
+        return slide_frames(self.geometry.step, self.speed)
 
     def go_home(self) -> tuple:
         """
@@ -49,22 +58,24 @@ class Tile(ImageTurtle):
         self.move(self.get_x_home(), self.get_y_home())
         return self.get_x_home(), self.get_y_home()
 
-    def move(self, x, y):
+    def move(self, x, y, delay=0):
         """
         Setter for the object's x-y coordinates
-        Also moves the turtle to the corresponding graphical location
+        Also moves the turtle to the corresponding graphical location; the turtle
+        slides there after any movement it still has to play
         :param x: new x location
         :param y: new y location
+        :param delay: number of animation frames to wait before sliding (default 0)
         """
         self.x_location = x
         self.y_location = y
         # move tile to location on the defined game grid
-        x_screen, y_screen = game_grid_to_screen_coord(x, y, self.tile_size())
-        self.turtle.goto(x_screen, y_screen)
+        x_screen, y_screen = self.geometry.screen_coord(x, y)
+        animator.slide(self.turtle, x_screen, y_screen, self.speed, delay)
 
     def tile_size(self):
         """Returns Tile's size (for GUI scaling)"""
-        return self.width_of_tile
+        return self.geometry.tile_size
 
     def current_x(self):
         """Returns Tile's current x position"""
@@ -84,17 +95,3 @@ class Tile(ImageTurtle):
         if x_is_home and y_is_home:
             return True
         return False
-
-
-def game_grid_to_screen_coord(x_grid, y_grid, scale):
-    """
-    Convert game grid x-y coordinates to screen x-y coordinates
-    Used to convert game logic/tile placement to screen drawings
-    :param x_grid: x-coordinate on game grid (i.e. 0-3)
-    :param y_grid: y-coordinate on game grid (i.e. 0-3)
-    :param scale: width of each tile to be used for scaling
-    :return: screen x-coordinate, screen y-coordinate
-    """
-    x_screen = x_grid * (scale + calculate_tile_gap(scale)) + calculate_tile_border(scale)
-    y_screen = y_grid * (scale + calculate_tile_gap(scale)) + calculate_tile_border(scale)
-    return x_screen, y_screen
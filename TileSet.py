@@ -4,105 +4,103 @@ CS 5002, Fall 2022
 Tile Game Project
 
 TileSet class keeps track of, and performs operations on, the Tiles of a sliding
-tile game.  It is created from a dictionary of puzzle data.
+tile game.  It is created from a dictionary of puzzle data.  The game logic itself
+lives in a headless Board; the TileSet mirrors that Board onto the screen.
 
 Includes a "shuffle" function that performs a series of randomly chosen legal moves
 (following certain rules) that GUARANTEES that a shuffled TileSet is solvable, because
 in the worst case, a player could perfectly undo each move that was performed
 while shuffling in reverse order.
+
+Each game is recorded (see GameRecording): the arrangement play begins from (after a
+shuffle or scramble), and every move made on it.
 """
-import turtle
 from math import sqrt
-from random import randint
+from Board import Board, random_board
+from GameRecording import start_recording
+from solver import solve, generate_board, HINT_TIME_LIMIT, GENERATE_TIME_LIMIT
 from Tile import Tile
 from ImageTurtle import ImageTurtle
-from gui import THUMBNAIL_X, THUMBNAIL_Y, calculate_tile_border, calculate_tile_gap
+from RenderTransaction import render
+from RenderBackend import get_backend
+from BoardGeometry import board_geometry
+from gui import THUMBNAIL_X, THUMBNAIL_Y
 
 
 class TileSet:
     """
     A set of n^2 Tile objects (plus a thumbnail object) reflecting a sliding puzzle
-    The Tiles are represented graphically, and are also tracked logically in an
-    n * n nested array: each Tile knows where it is, and the TileSet also knows
-    where each tile is.
+    The game logic lives in a headless Board (a flat permutation of tile numbers);
+    the Tiles are a view of that Board: each Tile knows where it is on screen,
+    and the TileSet mirrors every change to the Board onto its Tiles.
 
     Can shuffle itself, unscramble itself, check whether it has been clicked,
     perform legal moves, count its moves, and check whether it has been solved.
     """
-    def __init__(self, puzzle_data: dict):
+    def __init__(self, puzzle_data: dict, renderer=None):
         """
         Create a new TileSet using a puzzle data dictionary to define
         the number of Tiles/puzzle width, image size of each Tile,
         and image files for use in each Tile (and the thumbnail ImageTurtle)
+        :param renderer: "turtle" or "canvas" backend for drawing the Tiles
+                         (default None: chosen by puzzle width; see RenderBackend)
         """
         self.data = puzzle_data
         self.tile_size = (puzzle_data['size'])
         self.width = int(sqrt(puzzle_data['number']))
+        self.backend = get_backend(renderer, self.width)
+        self.board = Board(self.width)
+        # where each cell is drawn, and which cell each click is in (worked out once)
+        self.geometry = board_geometry(self.board.columns, self.board.rows,
+                                       self.tile_size)
+        self.start_board = self.board.copy()  # arrangement when play began
+        self.known_solution = None  # (arrangement, shortest solution from it)
         self.moves = 0
         self.victory = False
+        self.recording = start_recording(self.board, puzzle_data['name'])
 
-        # create Tiles and thumbnail
-        turtle.tracer(False)
-        self.thumbnail = ImageTurtle(puzzle_data['thumbnail'], THUMBNAIL_X, THUMBNAIL_Y)
-        self.tiles = []
-        for row in range(self.width):
-            new_row = []
-            for column in range(self.width):
-                new_row.append(Tile(puzzle_data['tile_icons'][column + row * self.width],
-                                    column, row, self.tile_size))
-            self.tiles.append(new_row)
-
-        # Tell the blank tile that it is blank, hide it, and make it fast
-        self.tiles[self.width - 1][self.width - 1].blank(True)
-        self.tiles[self.width - 1][self.width - 1].hide()
-        self.tiles[self.width - 1][self.width - 1].change_speed(0)
-        self.the_blank = self.blank_location(self.width - 1, self.width - 1)
+        # create Tiles and thumbnail; tiles[n] is the Tile whose home is board cell n
+        with render:
+            self.thumbnail = ImageTurtle(puzzle_data['thumbnail'],
+                                         THUMBNAIL_X, THUMBNAIL_Y)
+            self.tiles = []
+            for index in range(self.board.size):
+                column, row = self.board.coordinates(index)
+                self.tiles.append(Tile(puzzle_data['tile_icons'][index],
+                                       column, row, self.geometry, self.backend))
 
-        self.is_shuffling = False
+            # Tell the blank tile that it is blank, hide it, and make it fast
+            self.tiles[self.board.blank].blank(True)
+            self.tiles[self.board.blank].hide()
+            self.tiles[self.board.blank].change_speed(0)
 
     def move_count(self):
         """Returns the count of how many moves have been performed"""
         return self.moves
 
     def set_speed(self, speed):
-        """Sets the speed of every Tile in the TileSet"""
-        for i in range(len(self.tiles)):
-            for j in range(len(self.tiles[i])):
-                self.tiles[i][j].change_speed(speed)
+        """Sets the speed of every (non-blank) Tile in the TileSet"""
+        for tile in self.tiles:
+            if not tile.blank():  # the hidden blank always moves instantly
+                tile.change_speed(speed)
 
-    def blank_location(self, column=None, row=None):
+    def blank_location(self):
         """
-        Instructs the TileSet to remember a new blank location, if one is provided.
-        Returns the currently or newly logged blank location.
-        :param column: If provided with row, record column as the location of the blank
-        :param row: If provided with column, record row as the location of the blank
-        :return: The current location of the blank tile (column, row)
+        Returns the current location of the blank tile (column, row)
         """
-        if column in range(self.width) and row in range(self.width):
-            self.the_blank = column, row
-        return self.the_blank
+        return self.board.blank_location()
 
     def shuffle(self, swaps=100, speed=0, trace=True):
         """
         Function -- shuffle
-            Shuffles the tiles by performing legal swaps. Randomly chooses to perform
-            a horizontal or vertical swap. If the blank tile is at the edge of the
-            game board (max or min), it is moved towards the center.
-
-            Otherwise, if the selected movement axis (horizontal or vertical) is the
-            same as the previous move, the blank is moved so that the previous move
-            is NOT undone.
-
-            Otherwise, if the previous move was in a different axis and the blank
-            is not at the gameboard edge, the blank is randomly swapped in one of
-            the directions along the chosen axis.
-
-            This ensures that successive randomly selected moves generally
-            increase, rather than decrease, the entropy of the gameboard.
+            Shuffles the tiles by performing legal swaps (see Board.shuffle_moves).
+            Each swap is performed on the Board and then mirrored onto the Tiles.
+            The Board is shuffled immediately; the animation of the swaps is
+            queued, one swap per frame (or per slide at a visible speed).
 
-            Additionally, since all shuffling is performed using legal moves,
-            it is GUARANTEED that the puzzle is still solvable, as in the worst
-            case the moves used to shuffle could be undone in reverse order.
+            Since all shuffling is performed using legal moves, it is GUARANTEED
+            that the puzzle is still solvable, as in the worst case the moves
+            used to shuffle could be undone in reverse order.
         :param swaps: the number of swaps to perform (default = 100)
             A larger number of swaps results in a more randomized tile layout
         :param speed: the speed of swaps to perform (default = 0: instant)
@@ -111,78 +109,141 @@ class TileSet:
             True (default): shuffle animation plays
             False: shuffle is completed almost immediately
         """
-        original_trace_state = turtle.tracer()
-        turtle.tracer(trace)
         self.set_speed(speed)
-        self.is_shuffling = True
-        last_move = 5
-
-        for swap in range(swaps):
-            # check current location of blank tile
-            column, row = self.blank_location()
-            # 50% chance of vertical swap
-            if randint(0, 1) == 1:
-                # tile in min row; can't move down
-                if row == 0:
-                    modifier = 1
-                    last_move = 2
-                # tile in max row; can't move up
-                elif row + 1 == self.width:
-                    modifier = -1
-                    last_move = 4
-                # don't undo the last move if it was also horizontal
-                elif last_move < 5:
-                    modifier = 3 - last_move
-                # randomly select +1 or -1
-                else:
-                    modifier = 2 * randint(0, 1) - 1
-                    last_move = 3 + modifier
-                self.swap_tiles(column, row + modifier, column, row)
-                self.blank_location(column, row + modifier)
-            # 50% chance of horizontal swap
-            else:
-                # tile in min column; can't move left
-                if column == 0:
-                    modifier = 1
-                    last_move = 6
-                # tile in max column; can't move right
-                elif column + 1 == self.width:
-                    modifier = -1
-                    last_move = 8
-                # don't undo the last move if it was also vertical
-                elif last_move > 5:
-                    modifier = 7 - last_move
-                # randomly select +1 or -1
-                else:
-                    modifier = 2 * randint(0, 1) - 1
-                    last_move = 7 + modifier
-                self.swap_tiles(column + modifier, row, column, row)
-                self.blank_location(column + modifier, row)
+        if trace:
+            step = max(1, self.tiles[0].move_frames())
+            for swap, (old_blank, new_blank) in enumerate(self.board.shuffle_moves(swaps)):
+                self.mirror(new_blank, delay=swap * step)
+                self.mirror(old_blank, delay=swap * step)
+        else:  # nothing is animated; only mirror the final arrangement
+            self.board.shuffle(swaps)
+            with render:
+                for index in range(self.board.size):
+                    self.mirror(index)
         self.set_speed(3)
-        self.is_shuffling = False
-        turtle.tracer(original_trace_state)
+        self.start_board = self.board.copy()
+        self.recording = start_recording(self.board, self.data['name'])
+
+    def scramble(self, minimum=None, maximum=None, time_limit=GENERATE_TIME_LIMIT):
+        """
+        Function -- scramble
+            Rearranges the tiles into a new solvable arrangement directly, instead
+            of by a random walk of swaps.  Without a band, every solvable
+            arrangement is equally likely; with a band, the arrangement's shortest
+            solution takes between minimum and maximum moves.
+        :param minimum: fewest moves the solution may take (optional)
+        :param maximum: most moves the solution may take (optional)
+        :param time_limit: number of seconds after which to give up (band only;
+                           see generate_board)
+        :return: True if the tiles were scrambled; False if the band is impossible or
+                 no arrangement in it was found in time
+        """
+        if minimum is None and maximum is None:
+            board = random_board(self.width)
+        else:
+            board = generate_board(self.width, minimum=minimum or 0, maximum=maximum,
+                                   time_limit=time_limit)
+            if board is False:
+                return False
+        self.arrange(board)
+        return True
+
+    def arrange(self, board):
+        """
+        Rearranges the tiles to match a Board, and begins play (and its recording)
+        from that arrangement
+        :param board: Board of the same shape as the TileSet's
+        """
+        self.board = board
+        with render:
+            for index in range(self.board.size):
+                self.mirror(index)
+        self.start_board = self.board.copy()
+        self.recording = start_recording(self.board, self.data['name'])
 
     def unscramble(self):
         """
-        All tiles are moved back to their home locations. The tiles array
-        is replaced with a new array that is properly ordered in order
-        of home position, as when the TileSet was first created.
+        All tiles are moved back to their home locations
+        The reset is recorded, as part of the game's recording
+        """
+        self.board.unscramble()
+        for tile in self.tiles:
+            tile.go_home()
+        self.recording.record_reset()
+
+    def hint(self, time_limit=None):
+        """
+        Finds the best next move with the solver
+        :param time_limit: optional number of seconds after which to give up
+        :return: (column, row) of the tile to click next; None if already solved;
+                 False if no hint was found within the time limit
+        """
+        solution = self.solution(time_limit)
+        if solution is False or len(solution) == 0:
+            return None if solution == [] else False
+        return self.board.coordinates(solution[0])
+
+    def solution(self, time_limit=None):
+        """
+        Returns the shortest solution (list of cell indices to slide into the blank)
+        from the current arrangement, or False if none was found within the time
+        limit.  The solution is remembered for as long as the player follows it.
         """
-        unscrambled_tiles = []
-        for row in range(self.width):
-            new_row = []
-            for column in range(self.width):
-                new_row.append([None])
-            unscrambled_tiles.append(new_row)
-        for i in range(len(self.tiles)):
-            for j in range(len(self.tiles[i])):
-                tile = self.tiles[i][j]
-                # tile moves to correct physical location
-                x_home, y_home = tile.go_home()
-                unscrambled_tiles[y_home][x_home] = tile
-        # tiles re-ordered in array
-        self.tiles = unscrambled_tiles
-        self.the_blank = self.blank_location(self.width - 1, self.width - 1)
+        snapshot = self.board.snapshot()
+        if self.known_solution is None or self.known_solution[0] != snapshot:
+            solution = solve(self.board, time_limit)
+            if solution is False:
+                return False
+            self.known_solution = snapshot, solution
+        return list(self.known_solution[1])
+
+    def auto_solve(self, time_limit=HINT_TIME_LIMIT):
+        """
+        Solves the puzzle on screen with the shortest sequence of moves.
+        Moves made by auto-solving are not counted.
+        :param time_limit: number of seconds after which to give up (None: no limit)
+        :return: True if the puzzle was solved; False if no solution was found in time
+        """
+        solution = self.solution(time_limit)
+        if solution is False:
+            return False
+        self.play(solution)
+        return True
+
+    def play(self, solution):
+        """
+        Plays a sequence of moves on screen, one after another.  The moves are
+        recorded, but not counted.
+        :param solution: list of cell indices to slide into the blank, in order
+        """
+        step = self.tiles[0].move_frames()
+        for move, index in enumerate(solution):  # moves play one after another
+            blank_index = self.board.blank_index
+            self.board.swap(index, blank_index)
+            self.recording.record_move(blank_index, index)
+            self.mirror(blank_index, delay=move * step)
+            self.mirror(index, delay=move * step)
+
+    def optimal_moves(self, time_limit=None):
+        """
+        Returns the fewest moves that could have solved the puzzle from where play
+        began, or False if that could not be determined within the time limit
+        """
+        solution = solve(self.start_board, time_limit)
+        if solution is False:
+            return False
+        return len(solution)
+
+    def mirror(self, index, delay=0):
+        """
+        Moves the Tile that the Board has in cell index to that cell on screen
+        :param index: cell index on the Board
+        :param delay: number of animation frames to wait before moving (default 0)
+        """
+        tile = self.tiles[self.board.cells[index]]
+        column, row = self.board.coordinates(index)
+        if (tile.current_x(), tile.current_y()) != (column, row):
+            tile.move(column, row, delay)
 
     def register_click(self, x, y):
         """
@@ -194,18 +255,14 @@ class TileSet:
         :param y: y-coordinate of click on screen
         :return: False if click is outside TileSet; True if click is inside TileSet
         """
-        column = int((x - calculate_tile_border(self.tile_size) + self.tile_size // 2) /
-                     (self.tile_size + calculate_tile_gap(self.tile_size)))
-        row = int((y - calculate_tile_border(self.tile_size) +
-                   self.tile_size // 2) /
-                  (self.tile_size + calculate_tile_gap(self.tile_size)))
-        if row not in range(0, self.width) or column not in range(0, self.width):
+        cell = self.geometry.cell_at(x, y)
+        if cell is None:
             return False
+        column, row = cell
 
         neighbor_is_blank = self.check_neighbors(column, row)
         if neighbor_is_blank is not False:
             self.swap_tiles(column, row, neighbor_is_blank[0], neighbor_is_blank[1])
-            self.blank_location(column, row)
             if self.is_solved():
                 self.victory = True
         return True
@@ -219,41 +276,40 @@ class TileSet:
         :param row: row reference of selected tile
         :return: (column, row) of blank tile (if adjacent); False otherwise
         """
-        col_dif = abs(column - self.blank_location()[0])
-        row_dif = abs(row - self.blank_location()[1])
-        if (col_dif + row_dif) == 1:
+        if self.board.is_next_to_blank(self.board.index(column, row)):
             return self.blank_location()
         else:
             return False
 
     def swap_tiles(self, column_1, row_1, column2, row_2):
         """
-        Swaps two tiles physically on the GUI as well as logically in the tiles array
+        Swaps two tiles logically on the Board, then physically on the GUI
         :param column_1: column reference (x) of first tile
         :param row_1: row reference (y) of first tile
         :param column2: column reference (x) of second tile
         :param row_2: row reference (y) of second tile
         """
-        a, b, c, d = row_1, column_1, row_2, column2
-        # swap tiles physically - tiles should know where they are
-        self.tiles[row_1][column_1].move(d, c)
-        self.tiles[row_2][column2].move(b, a)
-        # swap tiles in array - tileset should know where tiles are
-        self.tiles[a][b], self.tiles[c][d] = self.tiles[c][d], self.tiles[a][b]
-
-        if not self.is_shuffling:
-            self.moves += 1
+        index_1 = self.board.index(column_1, row_1)
+        index_2 = self.board.index(column2, row_2)
+        # a player following the known solution is still on a shortest path
+        if self.known_solution is not None and self.known_solution[1][:1] == [index_1] \
+                and self.board.blank_index == index_2:
+            following = self.known_solution[1][1:]
+        else:
+            following = None
+        blank_before = self.board.blank_index
+        self.board.swap(index_1, index_2)
+        if self.board.blank_index != blank_before:
+            self.recording.record_move(blank_before, self.board.blank_index)
+        self.mirror(index_1)
+        self.mirror(index_2)
+        self.moves += 1
+        if following is not None:
+            self.known_solution = self.board.snapshot(), following
 
     def is_solved(self):
-        """
-        Checks every tile to determine if each is 'home'. If all tiles are home,
-        return True; if any tile is not home, return false.
-        """
-        for i in range(len(self.tiles)):
-            for j in range(len(self.tiles[i])):
-                if not self.tiles[i][j].is_home():
-                    return False
-        return True
+        """Returns True if every tile is 'home'; returns False otherwise"""
+        return self.board.is_solved()
 
     def victory_achieved(self):
         """Returns True if the puzzle has been solved; returns False otherwise"""
@@ -261,9 +317,7 @@ class TileSet:
 
     def reset(self):
         """Makes each tile disappear in preparation for deletion/replacement"""
-        turtle.tracer(False)
-        for row in range(len(self.tiles)):
-            for column in range(len(self.tiles[row])):
-                self.tiles[row][column].disappear()
-        self.thumbnail.disappear()
-        turtle.tracer(True)
+        with render:
+            for tile in self.tiles:
+                tile.disappear()
+            self.thumbnail.disappear()
@@ -0,0 +1,88 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+TurtlePool Class reuses turtles instead of creating new ones.  Turtle has no way to
+delete a turtle: a turtle that is no longer needed stays in the screen's list of
+turtles, with its canvas items, for as long as the program runs.  Loading a puzzle
+(n^2 Tiles) or changing a popup's image would otherwise add turtles forever.
+
+ImageTurtles check a turtle out of the pool when they are created and return it when
+they disappear; a returned turtle is hidden and waits to be checked out again.  A
+returned turtle is given turtle's (polygon) "classic" shape: when it is given an image
+again, turtle replaces its canvas item with a new one, drawn above the older turtles
+as a new turtle would be.  A single TurtlePool is shared by the whole game: "pool".
+"""
+import turtle
+from Animator import animator
+from ImageRegistry import images
+
+
+class TurtlePool:
+    """
+    A pool of reusable turtles.  Counts the turtles it has created, so that it can
+    be confirmed that the number of turtles stays flat.
+    """
+    def __init__(self):
+        """Creates an empty TurtlePool"""
+        self.free = []  # hidden turtles waiting to be checked out
+        self.free_set = set()  # the same turtles, to find a turtle returned twice
+        self.created = 0
+        self.checkouts = 0
+
+    def checkout(self):
+        """
+        Returns a shown, pen-up, instant-speed turtle on the top layer of the screen,
+        reusing a returned turtle if there is one
+        """
+        self.checkouts += 1
+        if not self.free:
+            self.created += 1
+            new_turtle = turtle.Turtle()
+            new_turtle.speed(0)
+            new_turtle.penup()
+            return new_turtle
+        reused = self.free.pop()
+        self.free_set.discard(reused)
+        reused.showturtle()
+        return reused
+
+    def checkin(self, a_turtle):
+        """
+        Takes back a turtle that is no longer needed: its movement is dropped, its
+        image is released, and it is hidden until it is checked out again.  A hidden
+        turtle is still drawn with its shape on every update, so it is given the
+        always-registered "classic" shape, leaving its image free to be evicted.
+        A turtle that is already in the pool is ignored.
+        """
+        if a_turtle in self.free_set:
+            return None
+        animator.forget(a_turtle)
+        a_turtle.hideturtle()
+        a_turtle.shape("classic")
+        images.release(a_turtle)
+        self.free.append(a_turtle)
+        self.free_set.add(a_turtle)
+
+    def live_count(self):
+        """Returns the number of turtles the pool has created (in use or free)"""
+        return self.created
+
+    def in_use(self):
+        """Returns the number of turtles currently checked out"""
+        return self.created - len(self.free)
+
+    def clear(self):
+        """Forgets every turtle (e.g. after the screen has been cleared)"""
+        self.free.clear()
+        self.free_set.clear()
+        self.created = 0
+
+    def __str__(self):
+        """Represent a TurtlePool by its counts"""
+        return f"{self.live_count()} turtles ({self.in_use()} in use, " \
+               f"{len(self.free)} free); {self.checkouts} checkouts"
+
+
+pool = TurtlePool()
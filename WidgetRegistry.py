@@ -0,0 +1,93 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+WidgetRegistry Class finds the Button under a click without asking every Button.
+The screen is divided into a uniform grid of square cells, and each registered Button
+is listed in every cell its click region overlaps; a click only needs to check the few
+Buttons listed in the cell it lands in.  Each Button can also be registered with a
+value (such as the key of the puzzle a thumbnail stands for), so that what a click
+selects is found directly from the Button that was clicked.
+"""
+
+CELL_SIZE = 75  # width and height of each grid cell, in screen coordinates
+
+
+class WidgetRegistry:
+    """
+    A spatial index of Buttons (or anything with a home position, a width and a
+    height, and a contains(x, y) method), each with an optional value
+    """
+    def __init__(self, cell_size=CELL_SIZE):
+        """
+        Creates an empty WidgetRegistry
+        :param cell_size: width and height of each grid cell
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> list of widgets, oldest first
+        self.values = {}  # widget -> value it was registered with
+
+    def add(self, widget, value=None):
+        """
+        Registers a widget, so that clicks inside its click region find it
+        If widgets overlap, the most recently added one is found first
+        :param widget: Button to register (no effect if already registered)
+        :param value: optional value to look up from the widget (see value())
+        """
+        if widget in self.values:
+            return None
+        self.values[widget] = value
+        for cell in self.widget_cells(widget):
+            self.cells.setdefault(cell, []).append(widget)
+
+    def remove(self, widget):
+        """Unregisters a widget (no effect if it is not registered)"""
+        if widget not in self.values:
+            return None
+        del self.values[widget]
+        for cell in self.widget_cells(widget):
+            self.cells[cell].remove(widget)
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+    def clear(self):
+        """Unregisters every widget"""
+        self.cells.clear()
+        self.values.clear()
+
+    def widget_at(self, x, y):
+        """
+        Finds the registered widget whose click region contains a point
+        :param x: x-coordinate of screen click
+        :param y: y-coordinate of screen click
+        :return: widget; None if no registered widget is at the point
+        """
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        for widget in reversed(self.cells.get(cell, [])):
+            if widget.contains(x, y):
+                return widget
+        return None
+
+    def value(self, widget):
+        """Returns the value a widget was registered with"""
+        return self.values[widget]
+
+    def widget_cells(self, widget):
+        """Returns the (column, row) of each grid cell a widget's click region overlaps"""
+        half_width = widget.get_width() / 2
+        half_height = widget.get_height() / 2
+        first_column = int((widget.get_x_home() - half_width) // self.cell_size)
+        last_column = int((widget.get_x_home() + half_width) // self.cell_size)
+        first_row = int((widget.get_y_home() - half_height) // self.cell_size)
+        last_row = int((widget.get_y_home() + half_height) // self.cell_size)
+        return [(column, row) for column in range(first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)]
+
+    def __contains__(self, widget):
+        """Returns True if a widget is registered"""
+        return widget in self.values
+
+    def __len__(self):
+        """Returns the number of registered widgets"""
+        return len(self.values)
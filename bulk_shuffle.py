@@ -0,0 +1,137 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Contains functions for generating many shuffled boards at once with NumPy, for
+pre-generating pools of puzzles.  Every board follows the same random walk rules as
+Board.shuffle_moves (edge bounce, no undoing the previous move along the same axis),
+but the rules are precomputed as a state transition table, all boards take each step
+together, and random bits are drawn in bulk.
+
+NumPy is only needed by this module; the game itself does not use it.
+
+Generate a pool of boards from the command line with:
+    python bulk_shuffle.py 4 100000 --swaps 1000 --output pool.npy
+"""
+import argparse
+from time import perf_counter
+import numpy as np
+
+BATCH_SIZE = 250000  # boards shuffled together (limits memory use)
+STEP_BLOCK = 64  # steps of random bits drawn at once
+LAST_MOVES = (2, 4, 5, 6, 8)  # last move codes of Board.shuffle_moves (5: none yet)
+
+
+def shuffle_boards(count, columns, rows=None, swaps=100, seed=None):
+    """
+    Function -- shuffle_boards
+        Shuffles count boards by random walks of legal moves (see
+        Board.shuffle_moves).  Each row of the result is a board's cells: the tile
+        number in each cell, in cell order, as used by Board(columns, rows, cells).
+    :param count: number of boards to generate
+    :param columns: number of columns on each board
+    :param rows: number of rows on each board (default: same as columns)
+    :param swaps: number of swaps to perform on each board (default = 100)
+    :param seed: optional seed, for repeatable pools
+    :return: (count, columns * rows) array of uint8 (uint16 for boards over 16x16)
+    """
+    rows = columns if rows is None else rows
+    size = columns * rows
+    dtype = np.uint8 if size <= 256 else np.uint16
+    generator = np.random.default_rng(seed)
+    boards = np.empty((count, size), dtype=dtype)
+    for start in range(0, count, BATCH_SIZE):
+        stop = min(start + BATCH_SIZE, count)
+        boards[start:stop] = _shuffle_batch(stop - start, columns, rows, swaps,
+                                            generator, dtype)
+    return boards
+
+
+def _shuffle_batch(count, columns, rows, swaps, generator, dtype):
+    """Shuffles one batch of boards together; see shuffle_boards"""
+    size = columns * rows
+    transitions = _transition_table(columns, rows)
+    boards = np.tile(np.arange(size, dtype=dtype), (count, 1))
+    cells = boards.reshape(-1)  # flat view: board k's cell i is cells[k * size + i]
+    board_start = np.arange(count, dtype=np.int64) * size
+    # walk state = blank cell * 5 + last move; blank starts in the last cell
+    state = np.full(count, (size - 1) * 5 + LAST_MOVES.index(5), dtype=np.int64)
+    blank = np.full(count, size - 1, dtype=np.int64)
+
+    for block in range(0, swaps, STEP_BLOCK):
+        # two random bits per board per step: axis and direction
+        random_bits = generator.integers(0, 256, size=(min(STEP_BLOCK, swaps - block),
+                                                       count), dtype=np.uint8) & 3
+        for bits in random_bits:
+            state = transitions[state * 4 + bits]
+            target = state // 5
+            # slide the target tile into the blank
+            cells[board_start + blank] = cells[board_start + target]
+            cells[board_start + target] = size - 1
+            blank = target
+    return boards
+
+
+def _transition_table(columns, rows):
+    """
+    Returns the random walk of Board.shuffle_moves as a table:
+    table[state * 4 + random bits] = next state, where state = blank cell * 5 + index
+    of the last move in LAST_MOVES, bit 0 chooses a vertical (1) or horizontal (0)
+    swap, and bit 1 chooses the direction (+1 or -1) when the rules allow a choice
+    """
+    size = columns * rows
+    table = np.empty(size * 5 * 4, dtype=np.int64)
+    for blank in range(size):
+        column, row = blank % columns, blank // columns
+        for last_index, last_move in enumerate(LAST_MOVES):
+            for bits in range(4):
+                direction = 2 * (bits >> 1) - 1
+                new_last = last_move
+                if bits & 1:  # vertical swap
+                    if row == 0:
+                        modifier, new_last = 1, 2
+                    elif row + 1 == rows:
+                        modifier, new_last = -1, 4
+                    elif last_move < 5:
+                        modifier = 3 - last_move
+                    else:
+                        modifier, new_last = direction, 3 + direction
+                    target = blank + modifier * columns
+                else:  # horizontal swap
+                    if column == 0:
+                        modifier, new_last = 1, 6
+                    elif column + 1 == columns:
+                        modifier, new_last = -1, 8
+                    elif last_move > 5:
+                        modifier = 7 - last_move
+                    else:
+                        modifier, new_last = direction, 7 + direction
+                    target = blank + modifier
+                table[(blank * 5 + last_index) * 4 + bits] = \
+                    target * 5 + LAST_MOVES.index(new_last)
+    return table
+
+
+def main():
+    """Generates a pool of shuffled boards from the command line"""
+    parser = argparse.ArgumentParser(description="Generate shuffled boards")
+    parser.add_argument("columns", type=int, help="board width")
+    parser.add_argument("count", type=int, help="number of boards")
+    parser.add_argument("--rows", type=int, help="board height")
+    parser.add_argument("--swaps", type=int, default=100, help="swaps per board")
+    parser.add_argument("--seed", type=int, help="random seed")
+    parser.add_argument("--output", default="pool.npy", help="output .npy filename")
+    arguments = parser.parse_args()
+
+    start = perf_counter()
+    boards = shuffle_boards(arguments.count, arguments.columns, arguments.rows,
+                            arguments.swaps, arguments.seed)
+    elapsed = perf_counter() - start
+    np.save(arguments.output, boards)
+    print(f"Saved {len(boards)} boards to {arguments.output} "
+          f"({len(boards) / elapsed * 60:,.0f} boards per minute)")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,26 +5,35 @@ Tile Game Project
 
 Contains functions for logging errors to a log file, finding valid puzzle files in the
 game directory, loading a puzzle file, and loading all puzzle files.
+
+A puzzle file either lists one image file per tile, or names a single sprite-sheet
+image and a grid size, from which the tiles are cut (see sprite_sheet).
+
+Puzzles packed into a bundle file (see puzzle_bundle) are read from the bundle; a .puz
+file changed since the bundle was packed is read from the file instead.
+
+Checked puzzles are kept in an index on disk (see PuzzleIndex), so that unchanged
+puzzles are not parsed and checked again each time the game starts.
 """
 from os import listdir, path
-from datetime import datetime
 from math import sqrt
+from sprite_sheet import gif_size, tile_size, tile_image_name, thumbnail_image_name
+from puzzle_bundle import open_bundle
+from PuzzleIndex import PuzzleIndex
+from ErrorLogger import logger, ERROR_FILE
 
-ERROR_FILE = "./Logs/error_log.err"
 PUZZLE_DIR = "./Puzzles"
 
 
-def log_error(error_message, print_to_console=False):
+def log_error(error_message, print_to_console=False, **context):
     """
     Append an error message (string) to a log file with a timestamp
+    The message is written in the background by the shared ErrorLogger
     :param print_to_console: choose whether the error should also be printed to console
     :param error_message: string to be saved to error log file
+    :param context: details saved with the message, e.g. puzzle="mario.puz", line=3
     """
-    with open(ERROR_FILE, mode='a') as out_file:
-        error_output = f"{datetime.now()}: Error: {error_message}\n"
-        out_file.write(error_output)
-    if print_to_console:
-        print(error_output)
+    logger.log(error_message, print_to_console, **context)
 
 
 def find_puzzles():
@@ -36,34 +45,61 @@ def find_puzzles():
     return puzzle_list
 
 
-def load_all_puzzles():
+def load_all_puzzles(use_bundle=True, use_index=True):
     """
-    Load and check each .puz file in the game directory
+    Load and check each .puz file in the game directory, and each bundled puzzle
     If it is valid, add it to a dictionary of valid puzzles,
     and add its thumbnail to a list of thumbnails
+    Puzzles whose files have not changed since they were last checked are taken
+    from the puzzle index instead of being loaded again
+    :param use_bundle: choose whether puzzles are read from the bundle file
+    :param use_index: choose whether the puzzle index is used (and updated)
     :return: Dictionary of all valid puzzles, list of all thumbnail images
     """
     puzzle_list = find_puzzles()
+    bundle = open_bundle() if use_bundle else None
+    if bundle is not None:  # bundled puzzles whose .puz file is no longer there
+        puzzle_list += [key for key in bundle.keys() if key not in puzzle_list]
     puzzle_dictionary = {}
     thumbnails_list = []
+    # indexed puzzles may have come from the bundle, so the index needs it too
+    index = PuzzleIndex() if use_index and use_bundle else None
     for each in puzzle_list:
-        puz = load_puzzle(each)
+        puzzle_file = path.join(PUZZLE_DIR, each)
+        puz = index.lookup(puzzle_file, each) if index is not None else None
+        if puz is None:
+            puz = load_puzzle(each, use_bundle)
+            if puz is not False and index is not None:
+                index.store(puzzle_file, each, puz)
         if puz is not False:
             puzzle_dictionary[each] = puz
             thumbnails_list.append(puzzle_dictionary[each]['thumbnail'])
+    if index is not None:
+        index.keep_only(puzzle_dictionary)
+        index.save()
     return puzzle_dictionary, thumbnails_list
 
 
-def load_puzzle(filename):
+def load_puzzle(filename, use_bundle=True):
     """
     :param filename:
+    :param use_bundle: choose whether the puzzle may be read from the bundle file
     :return: Dictionary containing 'name', 'number' (of tiles), 'size' (pixels),
-    'tile_icons' (list of tile image files), 'thumbnail' (image filename)
+    'tile_icons' (list of tile image files), 'thumbnail' (image filename);
+    sprite-sheet puzzles also contain 'image' (sheet filename) and 'grid' (tiles
+    per side), and their tile images are named after the sheet (see sprite_sheet)
     """
+    bundle = open_bundle() if use_bundle else None
+    if bundle is not None and filename in bundle:
+        if bundle.is_current(filename, path.join(PUZZLE_DIR, filename)):
+            return bundle.puzzle(filename)  # already checked when it was packed
+        log_error("Puzzle bundle is out of date; reading the puzzle's files instead",
+                  puzzle=filename)
     try:
         metadata = {}
+        line_number = 0
         with open(path.join(PUZZLE_DIR, filename), mode='r') as in_file:
-            for line in in_file:
+            for line_number, line in enumerate(in_file, start=1):
                 key, value = line.strip("\n").split(": ")
                 # process puzzle's number of tiles
                 if key == 'number':
@@ -85,6 +121,21 @@ def load_puzzle(filename):
                     else:  # thumbnail file could not be found
                         missing_file = value
                         raise ImageMissing
+                # process sprite sheet's image filename (only its header is read)
+                elif key == 'image':
+                    if not path.isfile(value):  # sheet file could not be found
+                        missing_file = value
+                        raise ImageMissing
+                    sheet_size = gif_size(value)
+                    if sheet_size is False:  # sheet is not a GIF image
+                        raise ImageFormatError
+                    metadata[key] = value
+                # process sprite sheet's number of tiles per side
+                elif key == 'grid':
+                    if int(value) < 2:
+                        raise SizeError
+                    metadata[key] = int(value)
+                    grid_line = line_number, line  # reported if 'number' disagrees
                 # all other data is expected to be image numbers (ints)
                 else:
                     if path.isfile(value):  # make sure image file exists
@@ -92,6 +143,21 @@ def load_puzzle(filename):
                     else:  # tile image file could not be found
                         missing_file = value
                         raise ImageMissing
+        # sprite-sheet puzzle: name every tile after its region of the sheet
+        if 'image' in metadata:
+            if 'grid' not in metadata:
+                missing_data = ['grid']
+                raise DataError
+            grid = metadata['grid']
+            if metadata.get('number', grid ** 2) != grid ** 2:
+                line_number, line = grid_line
+                raise SizeError  # 'number' disagrees with 'grid'
+            metadata['number'] = grid ** 2
+            metadata['size'] = tile_size(*sheet_size, grid)
+            metadata['tile_icons'] = [tile_image_name(metadata['image'], index, grid)
+                                      for index in range(grid ** 2)]
+            if 'thumbnail' not in metadata:
+                metadata['thumbnail'] = thumbnail_image_name(metadata['image'])
         # check that all required fields were loaded
         missing_data = []
         for each in ['name', 'number', 'size', 'thumbnail', 'tile_icons']:
@@ -104,36 +170,47 @@ def load_puzzle(filename):
             raise DataError
         return metadata
     except FileNotFoundError:  # metadata file could not be found
-        log_error(f"FileNotFoundError: File '{filename}' could not be found.")
+        log_error(f"FileNotFoundError: File '{filename}' could not be found.",
+                  puzzle=filename)
         return False
     except TypeError:  # invalid filename input
-        log_error(f"TypeError: Error reading '{filename}'.")
+        log_error(f"TypeError: Error reading '{filename}'.", puzzle=filename)
         return False
     except OSError:  # invalid filename input
-        log_error(f"OSError: Error reading '{filename}'.")
+        log_error(f"OSError: Error reading '{filename}'.", puzzle=filename)
         return False
     except KeyError:  # metadata file is missing 'number' (of tiles)
-        log_error(f"KeyError: File '{filename}' is missing line 'number'.")
+        log_error(f"KeyError: File '{filename}' is missing line 'number'.",
+                  puzzle=filename)
         return False
     except IndexError:  # metadata contained an image number exceeding 'number' of tiles
         log_error(f"IndexError: File '{filename}' contained extra or incorrect data. "
-                  f"Error with line: {line}")
+                  f"Error with line: {line}",
+                  puzzle=filename, line=line_number)
         return False
     except ValueError:  # metadata file contained a line beginning with an invalid key
         log_error(f"ValueError: File {filename} contained invalid data. "
-                  f"Error with line: {line}")
+                  f"Error with line: {line}",
+                  puzzle=filename, line=line_number)
         return False
     except DataError:  # metadata file missing one or more lines of data
         log_error(f"DataError: File '{filename}' was incomplete. "
-                  f"Missing data: {', '.join(map(str, missing_data))}")
+                  f"Missing data: {', '.join(map(str, missing_data))}",
+                  puzzle=filename)
         return False
     except ImageMissing:  # metadata file referred to a nonexistent image file
         log_error(f"ImageMissing: File '{filename}' referenced a nonexistent file. "
-                  f"Missing image: {missing_file}")
+                  f"Missing image: {missing_file}", puzzle=filename, line=line_number)
+        return False
+    except ImageFormatError:  # sprite sheet is not a GIF image
+        log_error(f"ImageFormatError: File '{filename}' referenced an image that is "
+                  f"not a GIF. Error with line: {line}",
+                  puzzle=filename, line=line_number)
         return False
     except SizeError:  # puzzle size is not square
         log_error(f"SizeError: File {filename} contained an invalid puzzle size. "
-                  f"Error with line: {line}")
+                  f"Error with line: {line}",
+                  puzzle=filename, line=line_number)
         return False
 
 
@@ -150,3 +227,8 @@ class DataError(Exception):
 class ImageMissing(Exception):
     """Used to distinguish metadata file errors versus image file errors"""
     pass
+
+
+class ImageFormatError(Exception):
+    """Sprite-sheet image file is not a GIF image"""
+    pass
@@ -32,6 +32,10 @@ THUMBNAIL_Y = OUTER_BORDER + 33  # 73
 
 WINDOW_NAME = "CS5001 Sliding Puzzle Game"
 
+# images the popups switch to during play (preloaded so switching never decodes)
+POPUP_IMAGES = ("Resources/Lose.gif", "Resources/quitmsg.gif",
+                "Resources/file_error.gif")
+
 
 def setup_main_screen():
     """Returns a turtle Screen object set up for use in the game"""
@@ -47,19 +51,16 @@ def setup_main_screen():
 def create_popups():
     """
     Create default status popup objects
-    :return: popup_too_many_files, popup_leaderboard_err, popup_game_status
+    :return: popup_leaderboard_err, popup_game_status
     """
-    popup_too_many_files = ImageTurtle("Resources/file_warning_9.gif",
-                                       BUTTON_X_RIGHT - 5 * BUTTON_SPACING, BUTTON_Y)
     popup_leaderboard_err = ImageTurtle("Resources/leaderboard_error.gif",
                                         (BOARD_SIZE + INNER_BORDER + WINDOW_WIDTH -
                                          OUTER_BORDER) / 2, BOARD_SIZE - 50)
     popup_game_status = ImageTurtle("Resources/winner.gif",
                                     (BOARD_SIZE + OUTER_BORDER) // 2,
                                     (BOARD_SIZE + OUTER_BORDER) // 2)
-    popup_too_many_files.hide()
     popup_game_status.hide()
-    return popup_too_many_files, popup_leaderboard_err, popup_game_status
+    return popup_leaderboard_err, popup_game_status
 
 
 def draw_gui_outlines():
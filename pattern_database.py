@@ -0,0 +1,296 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Contains the PatternDatabase class and functions to build pattern database files.
+
+A disjoint additive pattern database splits the tiles of a board into groups.  For each
+group, it records the fewest moves of that group's tiles needed to bring them home,
+for every arrangement of the group (moves of other tiles are free).  Because no move
+is counted by two groups, the recorded values of all groups can be added together
+into a heuristic that is much stronger than Manhattan distance.
+
+Each database file holds every group of one board shape.  A value is stored as the
+number of moves needed beyond the group's Manhattan distance, halved (the difference
+is always even), so that it fits in a nibble; values are packed two per byte, and
+capped at 15 so that they remain lower bounds.  Files are opened with mmap and read
+in place, so nothing is loaded or rebuilt at startup.
+
+Build a database with (this can take several minutes):
+    python pattern_database.py 4
+"""
+import argparse
+import mmap
+import struct
+from os import path, makedirs
+from Board import neighbor_table
+
+DATABASE_DIR = "./Databases"
+MAGIC = b"TPDB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBB")  # magic, version, columns, rows, number of groups
+MAX_VALUE = 15  # largest value that fits in a nibble
+
+# default tile groups (0-based tile numbers) for each board shape
+DEFAULT_PATTERNS = {
+    (3, 3): ((0, 1, 2, 3), (4, 5, 6, 7)),
+    (4, 4): ((0, 1, 2, 3, 6), (4, 5, 8, 9, 12), (7, 10, 11, 13, 14)),
+    (5, 5): ((0, 1, 5, 6), (2, 3, 7, 8), (4, 9, 14, 19),
+             (10, 11, 15, 16), (12, 13, 17, 18), (20, 21, 22, 23)),
+}
+
+# opened databases, shared by every search; None if no file exists for the shape
+_OPEN_DATABASES = {}
+
+
+class PatternDatabase:
+    """
+    A read-only, memory-mapped disjoint additive pattern database for one board shape.
+    Group arrangements are indexed by the cells of the group's tiles:
+        index = sum(cell of i-th tile * size ** (number of tiles - 1 - i))
+    so moving one tile changes the index by (new cell - old cell) * weight.
+    """
+    def __init__(self, filename):
+        """
+        Opens a pattern database file
+        :param filename: path of the database file
+        """
+        self.filename = filename
+        with open(filename, mode='rb') as in_file:
+            self.map = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.columns, self.rows, number_of_groups = \
+            HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"'{filename}' is not a pattern database file")
+        self.size = self.columns * self.rows
+
+        # read group definitions, then find each group's table
+        self.groups = []
+        offset = HEADER.size
+        for i in range(number_of_groups):
+            count = self.map[offset]
+            self.groups.append(tuple(self.map[offset + 1:offset + 1 + count]))
+            offset += 1 + count
+        self.tables = []
+        view = memoryview(self.map)
+        for group in self.groups:
+            length = table_length(self.size, len(group))
+            self.tables.append(view[offset:offset + length])  # zero-copy view
+            offset += length
+
+        # for each tile: (group number, weight of tile's cell in group index)
+        self.tile_groups = [None] * self.size
+        for number, group in enumerate(self.groups):
+            for slot, tile in enumerate(group):
+                self.tile_groups[tile] = number, self.size ** (len(group) - 1 - slot)
+
+    def group_indices(self, cells):
+        """
+        Returns the index of each group's arrangement for a list of cells
+        :param cells: sequence of tile numbers, in cell order
+        """
+        indices = [0] * len(self.groups)
+        for cell, tile in enumerate(cells):
+            if self.tile_groups[tile] is not None:
+                number, weight = self.tile_groups[tile]
+                indices[number] += cell * weight
+        return indices
+
+    def value(self, group_number, index):
+        """
+        Returns the value recorded for one group in one arrangement: half the
+        number of moves needed beyond the group's Manhattan distance
+        """
+        return (self.tables[group_number][index >> 1] >> ((index & 1) << 2)) & 15
+
+    def lookup(self, board):
+        """Returns the total (heuristic) value of a Board's arrangement"""
+        columns = board.columns
+        total = 0
+        for cell, tile in enumerate(board.cells):
+            if self.tile_groups[tile] is not None:
+                total += abs(cell % columns - tile % columns) + \
+                    abs(cell // columns - tile // columns)
+        for number, index in enumerate(self.group_indices(board.cells)):
+            total += 2 * self.value(number, index)
+        return total
+
+    def close(self):
+        """Releases the memory map"""
+        for table in self.tables:
+            table.release()
+        self.map.close()
+
+
+def database_filename(columns, rows):
+    """Returns the default filename of the database for a board shape"""
+    return path.join(DATABASE_DIR, f"pdb_{columns}x{rows}.pdb")
+
+
+def open_database(columns, rows):
+    """
+    Returns the PatternDatabase for a board shape, opening it the first time it
+    is needed; returns None if no database has been built for that shape
+    """
+    if (columns, rows) not in _OPEN_DATABASES:
+        filename = database_filename(columns, rows)
+        database = None
+        if path.isfile(filename):
+            try:
+                database = PatternDatabase(filename)
+                if (database.columns, database.rows) != (columns, rows):
+                    database.close()
+                    database = None
+            except (OSError, ValueError):
+                database = None
+        _OPEN_DATABASES[(columns, rows)] = database
+    return _OPEN_DATABASES[(columns, rows)]
+
+
+def table_length(size, tiles_in_group):
+    """Returns the number of bytes holding one group's nibble-packed table"""
+    return (size ** tiles_in_group + 1) // 2
+
+
+def build_group(columns, rows, group, progress=None):
+    """
+    Function -- build_group
+        Finds the fewest moves of a group's tiles needed to bring them home, for
+        every arrangement of the group.  A breadth-first search works backwards
+        from the solved arrangement; moves of the blank through cells that are not
+        occupied by group tiles are free, so the blank is tracked as the region of
+        cells it can reach for free.
+    :param columns: number of columns on the board
+    :param rows: number of rows on the board
+    :param group: tuple of tile numbers in the group
+    :param progress: optional function called with (moves, arrangements found)
+    :return: nibble-packed table (bytearray) of values (moves beyond the group's
+             Manhattan distance, halved), capped at MAX_VALUE
+    """
+    size = columns * rows
+    neighbors = neighbor_table(columns, rows)
+    tiles = len(group)
+    weights = [size ** (tiles - 1 - slot) for slot in range(tiles)]
+    values = bytearray([255]) * (size ** tiles)
+    visited = bytearray((size ** tiles * size + 7) // 8)  # (index, blank cell) bits
+
+    goal = sum(tile * weight for tile, weight in zip(group, weights))
+    current = [goal * size + size - 1]  # states are index * size + blank cell
+    moves = 0
+    found = 0
+    while current:
+        upcoming = []
+        for state in current:
+            index, blank = divmod(state, size)
+            if visited[state >> 3] & (1 << (state & 7)):
+                continue
+            # cells of this arrangement's tiles
+            cells = []
+            remainder = index
+            for weight in weights:
+                cell, remainder = divmod(remainder, weight)
+                cells.append(cell)
+            occupied = set(cells)
+
+            # find every cell the blank can reach for free; mark them all visited
+            region = [blank]
+            reached = {blank}
+            for cell in region:
+                for neighbor in neighbors[cell]:
+                    if neighbor not in reached and neighbor not in occupied:
+                        reached.add(neighbor)
+                        region.append(neighbor)
+            for cell in region:
+                bit = index * size + cell
+                visited[bit >> 3] |= 1 << (bit & 7)
+            if values[index] == 255:
+                manhattan = 0
+                for tile, cell in zip(group, cells):
+                    manhattan += abs(cell % columns - tile % columns) + \
+                        abs(cell // columns - tile // columns)
+                values[index] = (moves - manhattan) // 2
+                found += 1
+
+            # move a group tile into the blank's region
+            for slot, cell in enumerate(cells):
+                for neighbor in neighbors[cell]:
+                    if neighbor in reached:
+                        new_index = index + (neighbor - cell) * weights[slot]
+                        bit = new_index * size + cell
+                        if not visited[bit >> 3] & (1 << (bit & 7)):
+                            upcoming.append(bit)
+        if progress is not None:
+            progress(moves, found)
+        current = upcoming
+        moves += 1
+
+    packed = bytearray(table_length(size, tiles))
+    for index, value in enumerate(values):
+        if value != 255:
+            packed[index >> 1] |= min(value, MAX_VALUE) << ((index & 1) << 2)
+    return packed
+
+
+def build_database(columns, rows, groups=None, filename=None, verbose=True):
+    """
+    Builds every group of a pattern database and saves it to a file
+    :param columns: number of columns on the board
+    :param rows: number of rows on the board
+    :param groups: tuple of tile groups (default: DEFAULT_PATTERNS for the shape)
+    :param filename: file to write (default: database_filename(columns, rows))
+    :param verbose: print progress to console
+    :return: filename of the database
+    """
+    if groups is None:
+        groups = DEFAULT_PATTERNS[(columns, rows)]
+    if filename is None:
+        filename = database_filename(columns, rows)
+    tiles = sorted(tile for group in groups for tile in group)
+    if len(set(tiles)) != len(tiles) or tiles[-1] >= columns * rows - 1:
+        raise ValueError("groups must not overlap or contain the blank")
+
+    tables = []
+    for number, group in enumerate(groups):
+        def progress(moves, found):
+            """Prints the search's progress"""
+            if verbose:
+                print(f"group {number + 1}/{len(groups)} {group}: "
+                      f"{moves} moves, {found} arrangements")
+        tables.append(build_group(columns, rows, group, progress))
+
+    directory = path.dirname(filename)
+    if directory:
+        makedirs(directory, exist_ok=True)
+    with open(filename, mode='wb') as out_file:
+        out_file.write(HEADER.pack(MAGIC, VERSION, columns, rows, len(groups)))
+        for group in groups:
+            out_file.write(bytes([len(group)]) + bytes(group))
+        for table in tables:
+            out_file.write(table)
+    if verbose:
+        print(f"Saved {filename}")
+    return filename
+
+
+def main():
+    """Builds a pattern database from the command line"""
+    parser = argparse.ArgumentParser(description="Build a pattern database")
+    parser.add_argument("columns", type=int, help="board width")
+    parser.add_argument("rows", type=int, nargs='?', help="board height")
+    parser.add_argument("--groups", help="tile groups (1-based), e.g. "
+                                         "1,2,3,4,7/5,6,9,10,13/8,11,12,14,15")
+    parser.add_argument("--output", help="database filename")
+    arguments = parser.parse_args()
+
+    rows = arguments.columns if arguments.rows is None else arguments.rows
+    groups = None
+    if arguments.groups is not None:
+        groups = tuple(tuple(int(tile) - 1 for tile in group.split(","))
+                       for group in arguments.groups.split("/"))
+    build_database(arguments.columns, rows, groups, arguments.output)
+
+
+if __name__ == '__main__':
+    main()
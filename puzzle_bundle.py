@@ -0,0 +1,204 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Contains the PuzzleBundle class and functions to pack puzzles into a bundle file.
+
+A bundle holds a whole puzzle library in a single file, so that loading it takes one
+file open instead of one per .puz file and one per image.  The file starts with a
+header and an index (each puzzle's name, number of tiles, tile size, and image names;
+each image's offset and length, counted from the end of the index, and the
+modification time of the file it was packed from), followed by the bytes of every
+image file.  Images shared by several puzzles are stored once.  The file
+is opened with mmap, and image bytes are handed out as views of the map, without
+copying.
+
+Bundled images are named "bundle:" followed by their original filename; the
+ImageRegistry reads such images from the bundle instead of from disk.  A puzzle whose
+.puz file or image files have changed since they were packed is read from its files
+instead (see PuzzleBundle.is_current), until the bundle is packed again.
+
+Pack the Puzzles directory into a bundle with:
+    python puzzle_bundle.py
+"""
+import argparse
+import json
+import mmap
+import struct
+from os import path, replace, stat
+from sprite_sheet import source_file
+
+BUNDLE_FILE = "./Puzzles/puzzles.bundle"
+MAGIC = b"TPZB"
+VERSION = 2
+HEADER = struct.Struct("<4sBI")  # magic, version, length of index in bytes
+IMAGE_PREFIX = "bundle:"
+
+# opened bundles, by filename; None if no valid bundle exists
+_OPEN_BUNDLES = {}
+
+
+class PuzzleBundle:
+    """
+    A read-only, memory-mapped bundle of puzzles.  Puzzles are looked up by the
+    filename of the .puz file they were packed from.
+    """
+    def __init__(self, filename):
+        """
+        Opens a bundle file
+        :param filename: path of the bundle file
+        """
+        self.filename = filename
+        self.mtime = path.getmtime(filename)
+        with open(filename, mode='rb') as in_file:
+            self.map = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"'{filename}' is not a puzzle bundle file")
+        index = json.loads(self.map[HEADER.size:HEADER.size + index_length])
+        self.puzzles = index['puzzles']
+        self.images = index['images']  # image filename -> [offset, length, mtime]
+        self.data_start = HEADER.size + index_length  # offsets count from here
+        self.view = memoryview(self.map)
+
+    def keys(self):
+        """Returns the .puz filenames of the bundled puzzles"""
+        return list(self.puzzles)
+
+    def __contains__(self, key):
+        """Returns True if a .puz filename is bundled"""
+        return key in self.puzzles
+
+    def is_current(self, key, puzzle_file):
+        """
+        Returns True if a bundled puzzle's files have not changed since it was packed:
+        its .puz file is not newer than the bundle, and each image file has the
+        modification time it was packed with (files that no longer exist are not
+        checked, so a bundle can be used without them)
+        :param key: .puz filename the puzzle was packed from
+        :param puzzle_file: path of the .puz file
+        """
+        if path.isfile(puzzle_file) and path.getmtime(puzzle_file) > self.mtime:
+            return False
+        metadata = self.puzzles[key]
+        for image in {source_file(image) for image in
+                      [metadata['thumbnail']] + metadata['tile_icons']}:
+            try:
+                if stat(image).st_mtime_ns != self.images[image][2]:
+                    return False
+            except OSError:
+                pass  # image file no longer exists; the bundle has it
+        return True
+
+    def puzzle(self, key):
+        """
+        Returns a bundled puzzle's data, in the same form as load_puzzle
+        (its image names refer to the bundle)
+        :param key: .puz filename the puzzle was packed from
+        """
+        metadata = dict(self.puzzles[key])
+        metadata['thumbnail'] = IMAGE_PREFIX + metadata['thumbnail']
+        metadata['tile_icons'] = [IMAGE_PREFIX + image
+                                  for image in metadata['tile_icons']]
+        return metadata
+
+    def image_data(self, image):
+        """
+        Returns the bytes of a bundled image file, as a view of the map (no copy)
+        :param image: original filename of the image (without IMAGE_PREFIX)
+        """
+        offset, length, mtime = self.images[image]
+        offset += self.data_start
+        return self.view[offset:offset + length]
+
+    def close(self):
+        """Releases the memory map"""
+        self.view.release()
+        self.map.close()
+
+
+def open_bundle(filename=BUNDLE_FILE):
+    """
+    Returns the PuzzleBundle in a file, opening it the first time it is needed;
+    returns None if there is no valid bundle file
+    """
+    if filename not in _OPEN_BUNDLES:
+        bundle = None
+        if path.isfile(filename):
+            try:
+                bundle = PuzzleBundle(filename)
+            except (OSError, ValueError, KeyError):
+                bundle = None
+        _OPEN_BUNDLES[filename] = bundle
+    return _OPEN_BUNDLES[filename]
+
+
+def is_bundle_image(image):
+    """Returns True if an image name refers to an image stored in the bundle"""
+    return image.startswith(IMAGE_PREFIX)
+
+
+def read_image(image):
+    """
+    Returns the bytes of an image file, from the bundle (as a view, without
+    copying) if its name refers to the bundle, or otherwise from disk
+    :param image: image filename, or bundled image name
+    """
+    if is_bundle_image(image):
+        return open_bundle().image_data(image[len(IMAGE_PREFIX):])
+    with open(image, mode='rb') as in_file:
+        return in_file.read()
+
+
+def write_bundle(puzzles, filename=BUNDLE_FILE):
+    """
+    Packs puzzles, and every image file they use, into a bundle file
+    :param puzzles: dictionary of .puz filename -> puzzle data (see load_puzzle)
+    :param filename: bundle file to write (replaced only once it is complete)
+    :return: number of images packed
+    """
+    # every image file used, once (tiles cut from a sprite sheet use the sheet)
+    image_files = []
+    for metadata in puzzles.values():
+        for image in [metadata['thumbnail']] + metadata['tile_icons']:
+            if source_file(image) not in image_files:
+                image_files.append(source_file(image))
+    images = {}
+    contents = []
+    offset = 0
+    for image in image_files:
+        with open(image, mode='rb') as in_file:
+            contents.append(in_file.read())
+            mtime = stat(in_file.fileno()).st_mtime_ns
+        images[image] = [offset, len(contents[-1]), mtime]
+        offset += len(contents[-1])
+
+    index = json.dumps({'puzzles': puzzles, 'images': images}).encode()
+
+    temporary = filename + ".tmp"
+    with open(temporary, mode='wb') as out_file:
+        out_file.write(HEADER.pack(MAGIC, VERSION, len(index)))
+        out_file.write(index)
+        for content in contents:
+            out_file.write(content)
+    replace(temporary, filename)
+    return len(images)
+
+
+def main():
+    """Packs the Puzzles directory into a bundle from the command line"""
+    from file_functions import load_all_puzzles
+
+    parser = argparse.ArgumentParser(description="Pack puzzles into a bundle")
+    parser.add_argument("--output", default=BUNDLE_FILE, help="bundle filename")
+    arguments = parser.parse_args()
+
+    puzzles, _ = load_all_puzzles(use_bundle=False)
+    count = write_bundle(puzzles, arguments.output)
+    print(f"Packed {len(puzzles)} puzzles ({count} images) into {arguments.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,9 @@ CS 5002, Fall 2022
 Tile Game Project
 
 Main function of the Tile Swap Game.  Displays a splash screen for several seconds on
-startup, then prompts the player for their name and win condition. Creates a Gameboard
-object to perform all following game functions.
+startup, then prompts the player for their name and win condition (how many moves
+beyond the best possible solution they want). Creates a Gameboard object to perform
+all following game functions.
 """
 import turtle
 from gui import SplashScreen
@@ -18,18 +19,18 @@ def start_game(startup=True):
         player_name = turtle.textinput("Welcome!", "Your Name:")
         if player_name == "":
             player_name = "1UP"
-        message = "Enter the number of moves you want: (5-200)"
+        message = "Enter the number of moves you want beyond the best solution: (0-200)"
         try:
-            moves_to_win = int(turtle.numinput("Difficulty Selection", message,
-                                               default=50, minval=5, maxval=200))
+            move_slack = int(turtle.numinput("Difficulty Selection", message,
+                                             default=20, minval=0, maxval=200))
         except TypeError:
-            moves_to_win = 50
+            move_slack = 20
     else:
         player_name = "1UP"
-        moves_to_win = 200
+        move_slack = 200
     turtle.clearscreen()
     try:
-        Gameboard(player_name, moves_to_win)
+        Gameboard(player_name, move_slack=move_slack)
     except FileNotFoundError:
         pass  # default puzzle could not be loaded
 
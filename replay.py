@@ -0,0 +1,187 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Contains functions to replay game recordings (see GameRecording).
+
+The headless replay runs a recording's moves on a plain list of cells, with a table of
+where the blank goes from each cell in each direction, so it checks millions of moves
+per second.  It confirms that every move was legal (the blank never left the board),
+and that the game really ended solved; the Leaderboard uses it to verify a score
+before accepting it.  A game that was reset (its tiles put back home for the player)
+does not verify.  A recording can also be watched on screen.
+
+Verify recordings with:
+    python replay.py Recordings/*.rec
+and watch one with:
+    python replay.py --gui Recordings/some_game.rec
+"""
+import argparse
+import time
+from GameRecording import load_recording, UP, DOWN, LEFT, RIGHT
+
+# the 4 directions packed in each possible byte, first move in the lowest 2 bits
+BYTE_DIRECTIONS = tuple(tuple(byte >> shift & 3 for shift in (0, 2, 4, 6))
+                        for byte in range(256))
+
+# tables of where the blank goes, by board shape
+_STEP_TABLES = {}
+
+
+def step_table(columns, rows):
+    """
+    Returns a table of where the blank goes from each cell in each direction:
+    table[cell * 4 + direction] is the new cell, or -1 if the move leaves the board
+    """
+    if (columns, rows) not in _STEP_TABLES:
+        table = []
+        for cell in range(columns * rows):
+            column, row = cell % columns, cell // columns
+            for direction in (UP, DOWN, LEFT, RIGHT):  # in order of their values
+                if direction == UP:
+                    table.append(cell - columns if row > 0 else -1)
+                elif direction == DOWN:
+                    table.append(cell + columns if row + 1 < rows else -1)
+                elif direction == LEFT:
+                    table.append(cell - 1 if column > 0 else -1)
+                else:
+                    table.append(cell + 1 if column + 1 < columns else -1)
+        _STEP_TABLES[(columns, rows)] = tuple(table)
+    return _STEP_TABLES[(columns, rows)]
+
+
+def replay(recording):
+    """
+    Replays a recording headlessly
+    :param recording: GameRecording
+    :return: (legal, solved, moves): whether every move was legal, whether the board
+             ended solved, and the number of moves replayed (up to any illegal one)
+    """
+    size = recording.columns * recording.rows
+    solved = list(range(size))
+    cells = list(recording.start_cells)
+    if sorted(cells) != solved:
+        return False, False, 0  # not a possible arrangement
+    blank_tile = size - 1
+    blank = cells.index(blank_tile)
+    table = step_table(recording.columns, recording.rows)
+    directions = [direction for byte in recording.moves
+                  for direction in BYTE_DIRECTIONS[byte]]
+    moves = 0
+    for reset in list(recording.resets) + [None]:  # play up to each reset, and on
+        for direction in directions[moves:recording.move_count if reset is None
+                                    else reset]:
+            target = table[blank * 4 + direction]
+            if target < 0:
+                return False, False, moves
+            cells[blank] = cells[target]
+            blank = target
+            moves += 1
+        if reset is not None:  # the tiles were put back home
+            cells = list(solved)
+            blank = blank_tile
+    cells[blank] = blank_tile
+    return True, cells == solved, moves
+
+
+def verify(recording, score=None):
+    """
+    Checks that a recording is of a legal game, never reset, that ended solved in
+    exactly the moves of a claimed score
+    :param recording: GameRecording
+    :param score: optional number of moves claimed (moves that were not counted,
+                  such as the blank's moves while auto-solving, make it fail)
+    :return: True if the recording verifies the game; False otherwise
+    """
+    if recording.resets:
+        return False  # the tiles were put back home for the player
+    legal, solved, moves = replay(recording)
+    if not (legal and solved):
+        return False
+    return score is None or moves == score
+
+
+def replay_on_screen(recording, speed=5):
+    """
+    Shows a recording being played on screen, with the recorded puzzle's images.
+    A game that was reset is shown from its last reset.
+    :param recording: GameRecording
+    :param speed: speed of each move (1: very slow; 9: fast)
+    :return: False if the recorded puzzle could not be found; otherwise returns
+             when the replay window is closed
+    """
+    import turtle
+    from Board import Board
+    from TileSet import TileSet
+    from gui import setup_main_screen
+    from file_functions import load_all_puzzles
+
+    puzzles, _ = load_all_puzzles()
+    matches = [data for data in puzzles.values() if data['name'] == recording.puzzle
+               and data['number'] == recording.columns * recording.rows]
+    if not matches:
+        print(f"Puzzle '{recording.puzzle}' ({recording.columns}x{recording.rows}) "
+              f"could not be found")
+        return False
+    setup_main_screen()
+    tileset = TileSet(matches[0])
+    directions = recording.directions()
+    if recording.resets:  # moves before the last reset do not affect the board
+        tileset.arrange(Board(recording.columns, recording.rows))
+        directions = directions[recording.resets[-1]:]
+        print(f"Showing the moves after the last of {len(recording.resets)} resets")
+    else:
+        tileset.arrange(Board(recording.columns, recording.rows,
+                              recording.start_cells))
+    tileset.set_speed(speed)
+    blank = tileset.board.blank_index
+    table = step_table(recording.columns, recording.rows)
+    solution = []  # cell of the tile slid into the blank by each move
+    for direction in directions:
+        blank = table[blank * 4 + direction]
+        if blank < 0:
+            break  # illegal move: show the game up to it
+        solution.append(blank)
+    tileset.play(solution)
+    turtle.mainloop()
+
+
+def main():
+    """Verifies recordings, or shows one on screen, from the command line"""
+    parser = argparse.ArgumentParser(description="Replay game recordings")
+    parser.add_argument("recordings", nargs="+", help="recording files")
+    parser.add_argument("--gui", action="store_true",
+                        help="show the first recording on screen")
+    arguments = parser.parse_args()
+
+    if arguments.gui:
+        replay_on_screen(load_recording(arguments.recordings[0]))
+        return None
+    total_moves = 0
+    start = time.perf_counter()
+    for filename in arguments.recordings:
+        try:
+            recording = load_recording(filename)
+        except (OSError, ValueError) as error:
+            print(f"{filename}: could not be read ({error})")
+            continue
+        legal, solved, moves = replay(recording)
+        total_moves += moves
+        if not legal:
+            result = "ILLEGAL MOVE"
+        elif not solved:
+            result = "not solved"
+        elif recording.resets:
+            result = "solved after a reset"
+        else:
+            result = "verified"
+        print(f"{filename}: {recording}: {result}")
+    seconds = time.perf_counter() - start
+    if seconds > 0:
+        print(f"Replayed {total_moves} moves in {seconds:.3f}s "
+              f"({total_moves / seconds:,.0f} moves per second)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Contains functions for finding the shortest solution of a sliding tile puzzle.
+Solutions are found with IDA* (iterative deepening A*) on a headless Board, using
+Manhattan distance plus linear conflicts as the heuristic, or the (stronger) additive
+pattern database for the board's shape when one has been built.  Heuristics are
+updated incrementally as the search makes and unmakes each move.
+
+A solution is a list of cell indices: each is the cell of the tile that slides into
+the blank, i.e. the tile the player would click on.
+
+Also generates boards whose shortest solution is within a requested number of moves.
+"""
+from time import perf_counter
+from Board import Board, neighbor_table, random_board
+from pattern_database import open_database
+
+# linear conflict values of a single row or column, shared between searches
+# (one dictionary per board shape)
+_LINE_CONFLICTS = {}
+_MAX_CACHED_LINES = 1000000
+
+# how many nodes to expand between checks of the time limit / cancel flag
+_CHECK_INTERVAL = 4096
+
+# seconds a hint (or an auto-solve) searches by default before giving up, so that a
+# hard board cannot stall it
+HINT_TIME_LIMIT = 10
+
+# most moves any arrangement needs ("God's number"), for shapes where it is known
+DIAMETERS = {(2, 2): 6, (2, 3): 21, (3, 2): 21, (2, 4): 36, (4, 2): 36, (3, 3): 31,
+             (3, 4): 53, (4, 3): 53, (4, 4): 80}
+# seconds generate_board searches by default before giving up, and seconds it spends
+# solving any one candidate before skipping it
+GENERATE_TIME_LIMIT = 5
+CANDIDATE_TIME_LIMIT = 1
+# boards tried by generate_board before giving up, when it has no time limit
+MAX_ATTEMPTS = 10000
+
+
+def manhattan_distance(board):
+    """Returns the sum of every tile's grid distance from its home cell"""
+    return board.manhattan_distance()
+
+
+def linear_conflict(board):
+    """
+    Returns the linear conflict penalty of a board: for each row and column,
+    twice the number of tiles that must leave that line so that the tiles which
+    belong in it can pass each other
+    """
+    columns, rows = board.columns, board.rows
+    cells = list(board.cells)
+    conflicts = _line_conflicts(board)
+    total = 0
+    for row in range(rows):
+        total += _row_conflict(cells, row, columns, board.blank, conflicts)
+    for column in range(columns):
+        total += _column_conflict(cells, column, columns, board.blank, conflicts)
+    return total
+
+
+def heuristic(board, database=None):
+    """
+    Returns an admissible estimate (lower bound) of a board's solution length
+    :param database: PatternDatabase to use; by default, the database built for the
+                     board's shape is used if there is one (False: use none)
+    """
+    estimate = manhattan_distance(board) + linear_conflict(board)
+    if database is None:
+        database = open_database(board.columns, board.rows)
+    if database:
+        estimate = max(estimate, database.lookup(board))
+    return estimate
+
+
+def inversion_distance(board):
+    """
+    Returns the inversion distance of a board, a lower bound on its solution length.
+    Horizontal moves never change the number of inversions of the tiles read row by
+    row, and a vertical move changes it by at most (columns - 1); likewise for
+    vertical moves and the tiles read column by column.
+    """
+    columns, rows = board.columns, board.rows
+    by_row = [tile for tile in board.cells if tile != board.blank]
+    by_column = [(tile % columns) * rows + tile // columns
+                 for column in range(columns)
+                 for tile in board.cells[column::columns] if tile != board.blank]
+    vertical_moves = -(-inversion_count(by_row) // max(1, columns - 1))
+    horizontal_moves = -(-inversion_count(by_column) // max(1, rows - 1))
+    return vertical_moves + horizontal_moves
+
+
+def inversion_count(sequence):
+    """Returns the number of pairs in a sequence of numbers that are out of order"""
+    inversions = 0
+    for i in range(len(sequence)):
+        for j in range(i + 1, len(sequence)):
+            if sequence[i] > sequence[j]:
+                inversions += 1
+    return inversions
+
+
+def estimate_difficulty(board, time_limit=None):
+    """
+    Function -- estimate_difficulty
+        Estimates the number of moves needed to solve a board.  Fast heuristics
+        (Manhattan distance and linear conflicts or the pattern database, and
+        inversion distance) give a lower bound; if a time limit is given, the
+        solver then tries to find the exact answer within it.
+    :param board: Board object to estimate
+    :param time_limit: seconds to spend on an exact solution (default: don't solve)
+    :return: (number of moves, True if exact / False if a lower bound)
+    """
+    estimate = max(heuristic(board), inversion_distance(board))
+    if time_limit:
+        solution = solve(board, time_limit)
+        if solution is not False:
+            return len(solution), True
+    return estimate, False
+
+
+def solve(board, time_limit=None, cancel=None, database=None, max_moves=None):
+    """
+    Function -- solve
+        Finds a shortest sequence of moves that solves a board, using IDA*.
+        The board itself is not changed.
+    :param board: Board object to solve (must be solvable)
+    :param time_limit: optional number of seconds after which to give up
+    :param cancel: optional callable; the search gives up as soon as it returns True
+    :param database: PatternDatabase to use; by default, the database built for the
+                     board's shape is used if there is one (False: use none)
+    :param max_moves: optional depth bound; the search gives up once it is sure no
+                      solution of at most this many moves exists
+    :return: list of cell indices to slide into the blank, in order
+             ([] if already solved); False if the search gave up
+    """
+    columns, size, blank = board.columns, board.size, board.blank
+    neighbors = neighbor_table(board.columns, board.rows)
+    cells = list(board.cells)
+    conflicts = _line_conflicts(board)
+    # distance[tile][cell] = Manhattan distance of tile from home when in cell
+    distance = [[abs(cell % columns - tile % columns) +
+                 abs(cell // columns - tile // columns) for cell in range(size)]
+                for tile in range(size)]
+    distance[blank] = [0] * size
+
+    row_conflicts = [_row_conflict(cells, row, columns, blank, conflicts)
+                     for row in range(board.rows)]
+    column_conflicts = [_column_conflict(cells, column, columns, blank, conflicts)
+                        for column in range(columns)]
+
+    # pattern database groups: each tile's (group, weight); each group's index/value
+    if database is None:
+        database = open_database(board.columns, board.rows)
+    if database:
+        tile_groups, tables = database.tile_groups, database.tables
+        group_index = database.group_indices(cells)
+        group_value = [database.value(number, index)
+                       for number, index in enumerate(group_index)]
+    else:
+        tile_groups, tables = [None] * size, []
+        group_index, group_value = [], []
+    path = []
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    counter = [_CHECK_INTERVAL]
+
+    def gave_up():
+        """Checks the time limit and cancel flag every so often"""
+        counter[0] -= 1
+        if counter[0] > 0:
+            return False
+        counter[0] = _CHECK_INTERVAL
+        if deadline is not None and perf_counter() > deadline:
+            return True
+        return cancel is not None and cancel()
+
+    def search(blank_index, previous, g, h, conflict_h, pattern_h, bound):
+        """
+        Depth-first search below bound; returns True if solved, otherwise the
+        smallest f-value that exceeded bound (or None if the search gave up).
+        h is Manhattan distance; on top of it, the heuristic adds either conflict_h
+        (linear conflicts) or, with a database, pattern_h (pattern database extra
+        moves).
+        """
+        f = g + h + (conflict_h if conflict_h > pattern_h else pattern_h)
+        if f > bound:
+            return f
+        if h == 0:
+            return True
+        if gave_up():
+            return None
+        smallest = None
+        for index in neighbors[blank_index]:
+            if index == previous:
+                continue
+            tile = cells[index]
+            # slide tile from index into blank_index
+            cells[blank_index], cells[index] = tile, blank
+            new_h = h + distance[tile][blank_index] - distance[tile][index]
+            if not database:  # (with a database, linear conflicts aren't worth it)
+                if index - blank_index in (1, -1):  # horizontal move: columns change
+                    lines, line_1, line_2 = column_conflicts, index % columns, \
+                        blank_index % columns
+                    old_1, old_2 = lines[line_1], lines[line_2]
+                    lines[line_1] = _column_conflict(cells, line_1, columns, blank,
+                                                     conflicts)
+                    lines[line_2] = _column_conflict(cells, line_2, columns, blank,
+                                                     conflicts)
+                else:  # vertical move: rows change
+                    lines, line_1, line_2 = row_conflicts, index // columns, \
+                        blank_index // columns
+                    old_1, old_2 = lines[line_1], lines[line_2]
+                    lines[line_1] = _row_conflict(cells, line_1, columns, blank, conflicts)
+                    lines[line_2] = _row_conflict(cells, line_2, columns, blank, conflicts)
+                new_conflict_h = conflict_h + lines[line_1] + lines[line_2] - old_1 - old_2
+            else:
+                new_conflict_h = 0
+            new_pattern_h = pattern_h
+            group = tile_groups[tile]
+            if group is not None:  # update the tile's pattern database group
+                number, weight = group
+                old_index, old_value = group_index[number], group_value[number]
+                new_index = old_index + (blank_index - index) * weight
+                new_value = (tables[number][new_index >> 1] >>
+                             ((new_index & 1) << 2)) & 15
+                group_index[number], group_value[number] = new_index, new_value
+                new_pattern_h += 2 * (new_value - old_value)
+            path.append(index)
+            result = search(index, blank_index, g + 1, new_h, new_conflict_h,
+                            new_pattern_h, bound)
+            if result is True:
+                return True
+            # unmake the move
+            path.pop()
+            cells[index], cells[blank_index] = tile, blank
+            if not database:
+                lines[line_1], lines[line_2] = old_1, old_2
+            if group is not None:
+                group_index[number], group_value[number] = old_index, old_value
+            if result is None:
+                return None
+            if smallest is None or result < smallest:
+                smallest = result
+        return smallest
+
+    h = sum(distance[tile][index] for index, tile in enumerate(cells))
+    conflict_h = 0 if database else sum(row_conflicts) + sum(column_conflicts)
+    pattern_h = 2 * sum(group_value)
+    bound = h + max(conflict_h, pattern_h)
+    while max_moves is None or bound <= max_moves:
+        result = search(board.blank_index, None, 0, h, conflict_h, pattern_h, bound)
+        if result is True:
+            return path
+        if result is None:
+            return False
+        bound = result
+    return False
+
+
+def hint(board, time_limit=HINT_TIME_LIMIT, cancel=None, database=None):
+    """
+    Returns the cell index of the best next move (the tile to slide into the blank),
+    None if the board is already solved, or False if the search gave up (by default,
+    after HINT_TIME_LIMIT seconds)
+    """
+    solution = solve(board, time_limit, cancel, database)
+    if solution is False:
+        return False
+    return solution[0] if solution else None
+
+
+def generate_board(columns, rows=None, minimum=0, maximum=None,
+                   time_limit=GENERATE_TIME_LIMIT):
+    """
+    Function -- generate_board
+        Generates a board whose shortest solution is between minimum and maximum
+        moves.  Boards are shuffled by random walks whose length is adjusted after
+        every attempt to approach the requested band; walks that would be longer
+        than a uniformly random board are replaced by one (see random_board).
+        Candidates are solved only as deep as the band allows, and skipped (with a
+        shorter walk) when that search passes maximum or CANDIDATE_TIME_LIMIT.
+    :param columns: number of columns on the board
+    :param rows: number of rows on the board (default: same as columns)
+    :param minimum: fewest moves the solution may take
+    :param maximum: most moves the solution may take (default: no limit)
+    :param time_limit: number of seconds after which to give up (default:
+                       GENERATE_TIME_LIMIT; None: give up after MAX_ATTEMPTS boards)
+    :return: Board in the requested band; False if the band is impossible, or none
+             was found in time
+    """
+    rows = columns if rows is None else rows
+    diameter = DIAMETERS.get((columns, rows))
+    if (maximum is not None and maximum < max(minimum, 0)) or \
+            (diameter is not None and minimum > diameter):
+        return False  # no arrangement is in the band
+    if maximum == 0:
+        return Board(columns, rows)  # only the solved board is in the band
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    longest_walk = 10 * columns * rows
+    target = minimum if maximum is None else (minimum + maximum) / 2
+    walk = max(1, int(2 * target))
+    attempts = 0
+    while perf_counter() < deadline if deadline is not None else attempts < MAX_ATTEMPTS:
+        attempts += 1
+        if walk >= longest_walk:
+            board = random_board(columns, rows)
+        else:
+            board = Board(columns, rows)
+            board.shuffle(walk)
+        if maximum is not None and heuristic(board) > maximum:
+            walk = max(1, walk * 3 // 4)
+            continue
+        limit = CANDIDATE_TIME_LIMIT
+        if deadline is not None:
+            limit = min(limit, deadline - perf_counter())
+        solution = solve(board, limit, max_moves=maximum)
+        if solution is False:
+            # too long (or too slow to tell): skip it and try a shorter walk
+            walk = max(1, walk * 3 // 4)
+            continue
+        if len(solution) >= minimum and (maximum is None or len(solution) <= maximum):
+            return board
+        # lengthen or shorten the walk in proportion to the miss
+        walk = max(1, min(longest_walk, int(walk * (target + 1) / (len(solution) + 1))))
+    return False
+
+
+def _line_conflicts(board):
+    """Returns the cache of line conflict values for boards shaped like board"""
+    shape = (board.columns, board.rows)
+    if shape not in _LINE_CONFLICTS:
+        _LINE_CONFLICTS[shape] = {}
+    conflicts = _LINE_CONFLICTS[shape]
+    if len(conflicts) > _MAX_CACHED_LINES:
+        conflicts.clear()
+    return conflicts
+
+
+def _row_conflict(cells, row, columns, blank, conflicts):
+    """Returns the linear conflict penalty of one row of cells"""
+    start = row * columns
+    line = ('row', row) + tuple(cells[start:start + columns])
+    if line not in conflicts:
+        conflicts[line] = _line_penalty([tile % columns for tile in line[2:]
+                                      if tile != blank and tile // columns == row])
+    return conflicts[line]
+
+
+def _column_conflict(cells, column, columns, blank, conflicts):
+    """Returns the linear conflict penalty of one column of cells"""
+    line = ('column', column) + tuple(cells[column::columns])
+    if line not in conflicts:
+        conflicts[line] = _line_penalty([tile // columns for tile in line[2:]
+                                      if tile != blank and tile % columns == column])
+    return conflicts[line]
+
+
+def _line_penalty(goals):
+    """
+    Returns the conflict penalty of a line whose tiles (that belong in it) have the
+    given home positions, in order: twice the number of tiles outside the longest
+    run of tiles that are already in increasing order
+    """
+    longest = [1] * len(goals)
+    for i in range(len(goals)):
+        for j in range(i):
+            if goals[j] < goals[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return 2 * (len(goals) - max(longest, default=0))
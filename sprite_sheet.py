@@ -0,0 +1,98 @@
+"""
+Christian Rogerson
+CS 5002, Fall 2022
+Tile Game Project
+
+Contains functions for sprite-sheet puzzles: puzzles whose tiles are cut from a single
+source image when they are loaded, instead of being listed as one pre-cut image file
+per tile.  A sprite-sheet .puz file names the source image and the number of tiles
+along each side:
+    name: mario_sheet
+    image: Images/mario/mario.gif
+    grid: 4
+The tile size is read from the image's GIF header; tiles are square, so a sheet that
+is not square is cut from the square at its centre.  A thumbnail is made by shrinking
+the source image unless a "thumbnail" line is given.  The same picture can therefore be
+offered as any n x n puzzle without shipping n^2 files.
+
+Tiles (and the made thumbnail) are named after their source image, e.g.
+"Images/mario/mario.gif#5/4" is tile 5 of a 4x4 grid.  The ImageRegistry decodes the
+source image once and cuts each tile out of it in memory, as a copy of its region.
+"""
+import tkinter
+from math import ceil
+
+NAME_SEPARATOR = "#"
+THUMBNAIL = "thumbnail"
+THUMBNAIL_SIZE = 120  # largest width or height of a made thumbnail, in pixels
+GIF_SIGNATURES = (b"GIF87a", b"GIF89a")
+
+
+def gif_size(filename):
+    """
+    Reads the width and height of a GIF image from its header, without decoding it
+    :param filename: GIF image file
+    :return: (width, height) in pixels; False if the file is not a GIF image
+    """
+    with open(filename, mode='rb') as in_file:
+        header = in_file.read(10)
+    if len(header) < 10 or header[:6] not in GIF_SIGNATURES:
+        return False
+    return int.from_bytes(header[6:8], 'little'), int.from_bytes(header[8:10], 'little')
+
+
+def tile_image_name(source, index, grid):
+    """Returns the image name of tile index (0-based) of a grid x grid sprite sheet"""
+    return f"{source}{NAME_SEPARATOR}{index}/{grid}"
+
+
+def thumbnail_image_name(source):
+    """Returns the image name of the thumbnail made from a sprite sheet"""
+    return f"{source}{NAME_SEPARATOR}{THUMBNAIL}"
+
+
+def parse_image_name(image):
+    """
+    Splits the name of an image cut from a sprite sheet into its parts
+    :param image: image name
+    :return: (source image file, tile index, grid), with tile index and grid None
+             for a thumbnail; None if the image is an ordinary image file
+    """
+    if NAME_SEPARATOR not in image:
+        return None
+    source, part = image.rsplit(NAME_SEPARATOR, 1)
+    if part == THUMBNAIL:
+        return source, None, None
+    index, grid = part.split("/")
+    return source, int(index), int(grid)
+
+
+def source_file(image):
+    """Returns the file an image is loaded from (its sprite sheet, if it has one)"""
+    parts = parse_image_name(image)
+    return image if parts is None else parts[0]
+
+
+def cut_image(sheet, index, grid):
+    """
+    Cuts a tile, or a thumbnail, out of a decoded sprite sheet
+    :param sheet: decoded source image (tkinter PhotoImage)
+    :param index: tile index (0-based, in row order); None for a thumbnail
+    :param grid: number of tiles along each side of the sheet
+    :return: new tkinter PhotoImage
+    """
+    if index is None:  # shrink the whole sheet to thumbnail size
+        factor = ceil(max(sheet.width(), sheet.height()) / THUMBNAIL_SIZE)
+        return sheet.subsample(max(factor, 1))
+    side = tile_size(sheet.width(), sheet.height(), grid)
+    # tiles are cut from the square at the centre of the sheet
+    left = (sheet.width() - side * grid) // 2 + index % grid * side
+    top = (sheet.height() - side * grid) // 2 + index // grid * side
+    tile = tkinter.PhotoImage(master=sheet.tk, width=side, height=side)
+    tile.tk.call(tile, 'copy', sheet, '-from', left, top, left + side, top + side)
+    return tile
+
+
+def tile_size(width, height, grid):
+    """Returns the width (and height) of the square tiles cut from a sprite sheet"""
+    return min(width, height) // grid